@@ -1,12 +1,24 @@
 from src.backends.backend_simulator import SimulatorBackend
 from src.backends.backend_ionq import IonQBackend
 from src.backends.backend_iqm import IQMBackend
+from src.backends.backend_statevector import StatevectorBackend
+from src.backends.backend_fake import FakeRemoteBackend
+from src.backends.backend_sa import SimulatedAnnealingBackend
+from src.backends.backend_tabu import TabuBackend
 
 def get_backend(name: str):
     name = name.lower()
 
     if name in ("sim", "simulator", "aer"):
         return SimulatorBackend()
+    elif name in ("sv", "statevector", "numpy"):
+        return StatevectorBackend()
+    elif name in ("sa", "anneal"):
+        return SimulatedAnnealingBackend()
+    elif name == "tabu":
+        return TabuBackend()
+    elif name == "fake":
+        return FakeRemoteBackend()
     elif name == "ionq":
         return IonQBackend()
     elif name == "iqm":
@@ -14,5 +26,5 @@ def get_backend(name: str):
     else:
         raise ValueError(
             f"Unknown backend '{name}'. "
-            "Choose from: sim | ionq | iqm"
+            "Choose from: sim | sv | sa | tabu | fake | ionq | iqm"
         )
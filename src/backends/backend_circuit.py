@@ -0,0 +1,56 @@
+from src.backends.executor import RemoteJob
+from src.qubo.counts import Counts
+from src.utils import tracing
+
+
+class CircuitBackend:
+    """
+    Shared bind -> provider job -> Counts -> energy flow of the circuit
+    backends (Aer, IonQ, IQM). Subclasses set `label`, `backend`, `shots`,
+    `transpile_options` and `_packed`, start jobs in _start() and override
+    _counts() when their results do not provide get_counts(i).
+    """
+
+    label = "circuit"
+
+    def _start(self, circuits, shots):
+        """Provider job running `circuits` (has result())."""
+        raise NotImplementedError
+
+    def _prepare(self, qc):
+        """Prebuilt circuit -> circuit the provider accepts."""
+        return qc
+
+    def _counts(self, result, i):
+        """Measured counts (or quasi-distribution) of circuit i."""
+        return result.get_counts(i)
+
+    def _finalize(self, arrays, result, size):
+        """(counts list, energies list) for the first `size` circuits of a provider result."""
+        counts = [Counts.from_dict(self._counts(result, i), arrays.n) for i in range(size)]
+        return counts, [arrays.expected(c) for c in counts]
+
+    def run(self, qc, bqm, var_names, shots=None):
+        """One prebuilt circuit, qubit i = var_names[i]."""
+        shots = shots or self.shots
+        with tracing.span("execute", backend=self.label, qubits=qc.num_qubits, shots=shots):
+            result = self._start([self._prepare(qc)], shots).result()
+        with tracing.span("decode"):
+            counts, energies = self._finalize(self._packed.get(bqm, var_names), result, 1)
+        return counts[0], energies[0]
+
+    def submit(self, template, param_sets, shots=None):
+        """Start one provider job for all parameter sets without waiting for it."""
+        circuits = [template.bind(params, self.backend, **self.transpile_options) for params in param_sets]
+        with tracing.span("submit", backend=self.label, circuits=len(circuits)):
+            job = self._start(circuits, shots or self.shots)
+        return RemoteJob(job, lambda result: self._finalize(template.arrays, result, len(circuits)))
+
+    def run_batch(self, template, param_sets, shots=None):
+        """All parameter sets as one provider job -> (counts list, energies list)."""
+        return self.submit(template, param_sets, shots).result()
+
+    def run_template(self, template, params, shots=None):
+        """Bind params into a template transpiled once for this backend, then run."""
+        counts, energies = self.run_batch(template, [params], shots)
+        return counts[0], energies[0]
@@ -0,0 +1,36 @@
+from src.backends.executor import CompletedJob, RemoteJob
+from src.qubo.counts import Counts
+from src.qubo.energy import QuboArrays
+from src.utils import tracing
+
+
+class ClassicalBackend:
+    """
+    Classical solver with the quantum backends' call shape; the circuit and
+    QAOA parameters are ignored. solve(arrays) -> (states, energies): counts
+    are the returned states, energy is their mean.
+    """
+
+    def __init__(self, solve, shots, name="classical"):
+        self.solve = solve
+        self.name = name
+        self.shots = shots
+        self.transpile_options = {}
+
+    def sample(self, arrays):
+        with tracing.span("execute", backend=self.name, variables=arrays.n):
+            X, E = self.solve(arrays)
+        return Counts.from_bits(X), float(E.mean())
+
+    def run(self, qc, bqm, var_names):
+        return self.sample(QuboArrays.from_bqm(bqm, var_names))
+
+    def run_template(self, template, params=None):
+        return self.sample(template.arrays)
+
+    def run_batch(self, template, param_sets):
+        results = [self.sample(template.arrays) for _ in param_sets]
+        return [c for c, _ in results], [e for _, e in results]
+
+    def submit(self, template, param_sets):
+        return RemoteJob(CompletedJob(self.run_batch(template, param_sets)), lambda result: result)
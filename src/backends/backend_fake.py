@@ -0,0 +1,79 @@
+"""
+Local fake remote provider with simulated queue latency; energies are
+estimated from sampled counts (exact=True for the exact <H>).
+"""
+
+import random
+import time
+
+from src.backends.backend_statevector import StatevectorBackend
+from src.backends.executor import RemoteJob
+from src.qubo.qubo_utils import PackedBQMs
+
+
+class FakeJob:
+    def __init__(self, compute, latency):
+        self._compute = compute
+        self._ready_at = time.monotonic() + latency
+        self._result = None
+
+    def status(self):
+        return "DONE" if self.in_final_state() else "QUEUED"
+
+    def in_final_state(self):
+        return time.monotonic() >= self._ready_at
+
+    def result(self):
+        delay = self._ready_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        if self._result is None:
+            self._result = self._compute()
+        return self._result
+
+
+class FakeRemoteBackend:
+    def __init__(self, latency=1.0, jitter=0.5, shots=1024, seed=None, fail_rate=0.0, exact=False):
+        self.latency = latency
+        self.jitter = jitter
+        self.fail_rate = fail_rate
+        self.exact = exact
+        self.shots = shots
+        self.transpile_options = {}
+        self._sim = StatevectorBackend(shots=shots, seed=seed)
+        self._rng = random.Random(seed)
+        self._packed = PackedBQMs()
+        self.submitted = 0
+
+    def submit(self, template, param_sets):
+        self.submitted += 1
+        param_sets = [list(p) for p in param_sets]
+        fail = self._rng.random() < self.fail_rate
+        shots = self.shots
+        exact = self.exact
+
+        def compute():
+            if fail:
+                raise RuntimeError("Fake job failed")
+            counts, energies = self._sim.run_batch(template, param_sets, shots)
+            if not exact:
+                energies = [template.arrays.expected(c) for c in counts]
+            return counts, energies
+
+        latency = self.latency + self._rng.uniform(0, self.jitter)
+        return RemoteJob(FakeJob(compute, latency), lambda result: result)
+
+    def run(self, qc, bqm, var_names):
+        """One circuit through the simulated queue (blocking, like the real providers' run())."""
+        latency = self.latency + self._rng.uniform(0, self.jitter)
+        counts, energy = FakeJob(lambda: self._sim.run(qc, bqm, var_names, self.shots), latency).result()
+        if not self.exact:
+            energy = self._packed.get(bqm, var_names).expected(counts)
+        return counts, energy
+
+    def run_template(self, template, params):
+        counts, energies = self.run_batch(template, [params])
+        return counts[0], energies[0]
+
+    def run_batch(self, template, param_sets):
+        return self.submit(template, param_sets).result()
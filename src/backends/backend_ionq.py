@@ -2,11 +2,16 @@ import os
 from dotenv import load_dotenv
 from qiskit import transpile
 from qiskit_ionq import IonQProvider
+from src.qubo.qubo_utils import PackedBQMs
+from src.backends.backend_circuit import CircuitBackend
+from src.utils import tracing
 
 load_dotenv()
 
 
-class IonQBackend:
+class IonQBackend(CircuitBackend):
+    label = "ionq"
+
     def __init__(self, shots=512, use_qpu=False):
         token = os.getenv("IONQ_API_KEY")
         if not token:
@@ -20,19 +25,13 @@ class IonQBackend:
             self.backend = provider.get_backend("ionq_simulator")
 
         self.shots = shots
+        self.transpile_options = {"optimization_level": 1}
+        self._packed = PackedBQMs()
         print("Connected to IonQ backend:", self.backend.name())
 
-    def run(self, qc, bqm, var_names):
-        qc_t = transpile(qc, backend=self.backend, optimization_level=1)
-        job = self.backend.run(qc_t, shots=self.shots)
-        result = job.result()
-        counts = result.get_counts()
-
-        # energy calculation (same as before)
-        total = sum(counts.values())
-        energy = 0.0
-        for bitstr, cnt in counts.items():
-            sample = {v: int(bitstr[i]) for i, v in enumerate(var_names)}
-            energy += (cnt / total) * bqm.energy(sample)
+    def _start(self, circuits, shots):
+        return self.backend.run(circuits, shots=shots)
 
-        return counts, energy
+    def _prepare(self, qc):
+        with tracing.span("transpile", qubits=qc.num_qubits):
+            return transpile(qc, backend=self.backend, **self.transpile_options)
@@ -1,8 +1,12 @@
 import os
 from iqm.qiskit_iqm import IQMProvider
 from qiskit.primitives import Sampler
+from src.qubo.qubo_utils import PackedBQMs
+from src.backends.backend_circuit import CircuitBackend
+
+class IQMBackend(CircuitBackend):
+    label = "iqm"
 
-class IQMBackend:
     def __init__(self, shots=1024):
         url = os.environ["IQM_URL"]
         device = os.environ["IQM_DEVICE"]
@@ -16,17 +20,13 @@ class IQMBackend:
         self.backend = provider.get_backend(device)
         self.sampler = Sampler(backend=self.backend)
         self.shots = shots
+        self.transpile_options = {}
+        self._packed = PackedBQMs()
 
         print(f"Connected to IQM backend: {self.backend.name()}")
 
-    def run(self, qc, bqm, var_names):
-        job = self.sampler.run(
-            circuits=[qc],
-            shots=self.shots
-        )
-        result = job.result()
-
-        counts = result.quasi_dists[0]
-        energy = bqm.energy_from_samples(counts, var_names)
+    def _start(self, circuits, shots):
+        return self.sampler.run(circuits=circuits, shots=shots)
 
-        return counts, energy
+    def _counts(self, result, i):
+        return result.quasi_dists[i]
@@ -0,0 +1,17 @@
+from src.backends.backend_classical import ClassicalBackend
+from src.qubo.annealing import simulated_annealing
+
+
+class SimulatedAnnealingBackend(ClassicalBackend):
+    """Classical fallback / baseline: vectorized multi-restart simulated annealing, one count per replica."""
+
+    def __init__(self, num_reads=256, sweeps=1000, processes=1, seed=None):
+        super().__init__(self._anneal, shots=num_reads, name="sa")
+        self.num_reads = num_reads
+        self.sweeps = sweeps
+        self.processes = processes
+        self.seed = seed
+
+    def _anneal(self, arrays):
+        return simulated_annealing(arrays, self.num_reads, self.sweeps,
+                                   seed=self.seed, processes=self.processes)
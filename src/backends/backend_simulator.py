@@ -1,13 +1,16 @@
 from qiskit_aer import AerSimulator
-from src.qubo.qubo_utils import expected_energy
+from src.qubo.qubo_utils import PackedBQMs
+from src.backends.backend_circuit import CircuitBackend
 
-class SimulatorBackend:
-    def __init__(self):
+class SimulatorBackend(CircuitBackend):
+    label = "aer"
+
+    def __init__(self, shots=2048):
         self.backend = AerSimulator()
+        self.shots = shots
+        self.transpile_options = {}
+        self.run_options = {}       # passed to AerSimulator.run, e.g. seed_simulator
+        self._packed = PackedBQMs()
 
-    def run(self, qc, bqm, var_names, shots=2048):
-        job = self.backend.run(qc, shots=shots)
-        result = job.result()
-        counts = result.get_counts()
-        energy = expected_energy(counts, bqm, var_names)
-        return counts, energy
+    def _start(self, circuits, shots):
+        return self.backend.run(circuits, shots=shots, **self.run_options)
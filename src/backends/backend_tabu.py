@@ -0,0 +1,20 @@
+from src.backends.backend_classical import ClassicalBackend
+from src.qubo.tabu import tabu_search
+
+
+class TabuBackend(ClassicalBackend):
+    """Classical baseline: multi-restart tabu search, counts hold the best state of each restart."""
+
+    def __init__(self, num_restarts=16, max_iter=None, tenure=None, time_limit=None,
+                 processes=1, seed=None):
+        super().__init__(self._search, shots=num_restarts, name="tabu")
+        self.num_restarts = num_restarts
+        self.max_iter = max_iter
+        self.tenure = tenure
+        self.time_limit = time_limit
+        self.processes = processes
+        self.seed = seed
+
+    def _search(self, arrays):
+        return tabu_search(arrays, self.num_restarts, self.max_iter, self.tenure,
+                           self.time_limit, seed=self.seed, processes=self.processes)
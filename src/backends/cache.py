@@ -0,0 +1,229 @@
+"""
+Persistent SQLite cache of circuit executions, with LRU size eviction and a
+read-only replay mode (a miss raises CacheMiss).
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from src.backends.executor import RemoteJob
+from src.qubo.counts import Counts
+
+PARAM_DECIMALS = 12
+FORMAT = 2      # bumped when stored results change meaning (2: packed Counts, Qiskit bit order)
+
+
+class CacheMiss(KeyError):
+    pass
+
+
+def template_fingerprint(template):
+    """
+    Hash of the problem's Ising form plus the ansatz structure (gate counts, p).
+
+    A ParameterShift takes per-gate angles theta instead of [gammas, betas];
+    it hashes as its wrapped template plus the theta layout (its jacobian).
+    """
+    if hasattr(template, "jacobian"):
+        digest = hashlib.sha256(template_fingerprint(template.template).encode())
+        jacobian = np.ascontiguousarray(template.jacobian, dtype=float)
+        digest.update(repr(("shift", jacobian.shape)).encode())
+        digest.update(jacobian.tobytes())
+        return digest.hexdigest()
+
+    const, h, J = template.ising
+    digest = hashlib.sha256()
+    digest.update(np.asarray(h, dtype=float).tobytes())
+    digest.update(repr(float(const)).encode())
+    for (i, j) in sorted(J):
+        digest.update(f"{i},{j}:{float(J[(i, j)])!r};".encode())
+    ops = sorted(template.circuit.count_ops().items())
+    digest.update(repr((template.p, template.circuit.num_qubits, ops)).encode())
+    return digest.hexdigest()
+
+
+def backend_name(backend):
+    inner = getattr(backend, "backend", None)
+    name = getattr(inner, "name", None)
+    if callable(name):
+        name = name()
+    return f"{type(backend).__name__}:{name}"
+
+
+def cache_key(fingerprint, params, shots, name, transpile_options):
+    payload = {
+        "problem": fingerprint,
+        "params": [round(float(x), PARAM_DECIMALS) + 0.0 for x in params],
+        "shots": shots,
+        "backend": name,
+        "transpile": sorted((k, repr(v)) for k, v in transpile_options.items()),
+        "format": FORMAT,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _dump_counts(counts):
+    return json.dumps({"n": counts.n, "states": counts.states.tolist(),
+                       "weights": counts.weights.tolist()})
+
+
+def _load_counts(text):
+    data = json.loads(text)
+    return Counts(np.array(data["states"], dtype=np.uint64).reshape(len(data["weights"]), -1),
+                  np.array(data["weights"]), data["n"])
+
+
+class ResultCache:
+    def __init__(self, path, max_bytes=256 * 2**20, readonly=False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.readonly = readonly
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY, counts TEXT, energy REAL,"
+            " size INTEGER, created REAL, accessed REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        self._db.commit()
+
+    def get(self, key):
+        """(counts, energy) or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT counts, energy FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if not self.readonly:
+                self._db.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+        return _load_counts(row[0]), row[1]
+
+    def put(self, key, counts, energy):
+        if self.readonly:
+            return
+        text = _dump_counts(counts)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (key, text, float(energy), len(text), now, now),
+            )
+            self._evict(keep=key)
+            self._db.commit()
+
+    def _evict(self, keep):
+        """Drop least recently used rows until under max_bytes (never the row just written)."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+            "SELECT key, size FROM results WHERE key != ? ORDER BY accessed ASC", (keep,)
+        ).fetchall():
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+
+class _CachedJob:
+    """Provider job for the cache misses of a batch, merged with the hits on result()."""
+
+    def __init__(self, inner, cached, keys, cache):
+        self.inner = inner
+        self.cached = cached
+        self.keys = keys
+        self.cache = cache
+
+    def in_final_state(self):
+        return self.inner is None or self.inner.done()
+
+    def result(self):
+        fresh = iter(zip(*self.inner.result())) if self.inner is not None else iter(())
+        counts, energies = [], []
+        for key, hit in zip(self.keys, self.cached):
+            if hit is None:
+                c, e = next(fresh)
+                self.cache.put(key, c, e)
+                hit = (c, e)
+            counts.append(hit[0])
+            energies.append(hit[1])
+        return counts, energies
+
+
+class CachedBackend:
+    """
+    Wraps any backend with submit(); identical executions are served from the cache.
+
+    Only sampled executions (submit / run_batch / run_template, including
+    parameter-shift batches) are cached. Everything else passes through to
+    the wrapped backend, notably the statevector backend's exact
+    expectation / expectation_and_gradient: those are local and
+    deterministic, so they are recomputed rather than stored, and they run
+    even in replay mode.
+    """
+
+    def __init__(self, backend, cache):
+        self.backend = backend
+        self.cache = cache
+        self.name = backend_name(backend)
+        self._fingerprints = {}
+
+    def __getattr__(self, attr):
+        return getattr(self.backend, attr)
+
+    @property
+    def shots(self):
+        return getattr(self.backend, "shots", None)
+
+    @shots.setter
+    def shots(self, value):
+        self.backend.shots = value
+
+    def _fingerprint(self, template):
+        key = id(template)
+        if key not in self._fingerprints:
+            self._fingerprints[key] = (template, template_fingerprint(template))
+        return self._fingerprints[key][1]
+
+    def keys(self, template, param_sets):
+        fingerprint = self._fingerprint(template)
+        shots = getattr(self.backend, "shots", None)
+        options = getattr(self.backend, "transpile_options", {})
+        return [cache_key(fingerprint, params, shots, self.name, options) for params in param_sets]
+
+    def submit(self, template, param_sets):
+        keys = self.keys(template, param_sets)
+        cached = [self.cache.get(k) for k in keys]
+        misses = [params for params, hit in zip(param_sets, cached) if hit is None]
+
+        if misses and self.cache.readonly:
+            raise CacheMiss(f"{len(misses)} of {len(keys)} executions not in replay cache")
+
+        inner = self.backend.submit(template, misses) if misses else None
+        return RemoteJob(_CachedJob(inner, cached, keys, self.cache), lambda result: result)
+
+    def run_batch(self, template, param_sets):
+        return self.submit(template, param_sets).result()
+
+    def run_template(self, template, params):
+        counts, energies = self.run_batch(template, [params])
+        return counts[0], energies[0]
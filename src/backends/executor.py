@@ -0,0 +1,165 @@
+"""
+Non-blocking execution layer: JobExecutor keeps many RemoteJobs in flight
+and resolves a concurrent.futures.Future per job (awaitable via arun).
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+
+from src.utils import tracing
+
+
+class RemoteJob:
+    """
+    Provider job + the function turning its raw result into
+    (counts list, energies list). `job` needs in_final_state() and result(),
+    as qiskit jobs (IonQ, Aer, primitives) provide.
+    """
+
+    def __init__(self, job, finalize):
+        self.job = job
+        self.finalize = finalize
+        self.submitted = tracing.now()
+
+    def done(self):
+        return self.job.in_final_state()
+
+    def result(self):
+        raw = self.job.result()
+        # submit -> result fetched: queueing + execution as seen by the client
+        tracing.record("job", self.submitted, job=type(self.job).__name__)
+        with tracing.span("decode"):
+            return self.finalize(raw)
+
+
+class CompletedJob:
+    """Job whose result is already known (local backends, cache hits)."""
+
+    def __init__(self, result):
+        self._result = result
+
+    def in_final_state(self):
+        return True
+
+    def result(self):
+        return self._result
+
+
+class JobExecutor:
+    def __init__(self, backend, max_in_flight=8, poll_interval=0.2,
+                 max_poll_interval=10.0, backoff=1.5):
+        self.backend = backend
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+
+    def submit(self, template, param_sets):
+        """Future resolving to (counts list, energies list); blocks only while max_in_flight jobs are pending."""
+        self._slots.acquire()
+        future = Future()
+        try:
+            job = self.backend.submit(template, param_sets)
+        except Exception as exc:
+            self._slots.release()
+            future.set_exception(exc)
+            return future
+
+        with self._lock:
+            self._pending.append((job, future))
+        self._wake.set()
+        return future
+
+    def submit_one(self, template, params):
+        """Future resolving to (counts, energy) for a single parameter set."""
+        outer = Future()
+
+        def unpack(inner):
+            if outer.cancelled():
+                return
+            if inner.exception() is not None:
+                outer.set_exception(inner.exception())
+            else:
+                counts, energies = inner.result()
+                outer.set_result((counts[0], energies[0]))
+
+        self.submit(template, [params]).add_done_callback(unpack)
+        return outer
+
+    def map(self, template, param_sets):
+        """(counts, energy) per parameter set, each as its own in-flight job."""
+        return [f.result() for f in [self.submit_one(template, p) for p in param_sets]]
+
+    async def arun(self, template, params):
+        # submit may wait for a free slot, so keep it off the event loop
+        future = await asyncio.to_thread(self.submit_one, template, params)
+        return await asyncio.wrap_future(future)
+
+    async def arun_batch(self, template, param_sets):
+        future = await asyncio.to_thread(self.submit, template, param_sets)
+        return await asyncio.wrap_future(future)
+
+    def _poll(self):
+        interval = self.poll_interval
+        while not self._stop:
+            with self._lock:
+                pending = list(self._pending)
+
+            finished = []
+            for job, future in pending:
+                try:
+                    if not job.done():
+                        continue
+                    result, error = job.result(), None
+                except Exception as exc:
+                    result, error = None, exc
+                # a cancelled future (caller stopped early) just frees its slot
+                if not future.cancelled():
+                    if error is None:
+                        future.set_result(result)
+                    else:
+                        future.set_exception(error)
+                finished.append((job, future))
+
+            if finished:
+                with self._lock:
+                    self._pending = [item for item in self._pending if item not in finished]
+                for _ in finished:
+                    self._slots.release()
+                interval = self.poll_interval
+            else:
+                interval = min(interval * self.backoff, self.max_poll_interval)
+
+            if not pending:
+                interval = self.poll_interval
+                self._wake.wait()
+            else:
+                self._wake.wait(interval)
+            self._wake.clear()
+
+    def shutdown(self, wait=True):
+        """Stop polling; with wait=True, first let in-flight jobs finish."""
+        if wait:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        break
+                time.sleep(self.poll_interval)
+        self._stop = True
+        self._wake.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
@@ -0,0 +1,210 @@
+"""
+benchmark_pipeline.py
+
+Goal:
+- Time the QUBO -> circuit -> execute -> decode hot paths on generated
+  networks from 8 to 30+ variables
+- Record Python heap peaks (tracemalloc) per stage plus process max RSS
+- Emit one JSON document so runs can be diffed across releases
+
+Stages:
+  build_network_qubo     problem_network.build_network_qubo
+  compile_qubo           Network.compile(P).to_qubo() (network_qaoa_sim.build_qubo path)
+  qubo_to_ising          network_qaoa_sim.qubo_to_ising
+  build_qaoa_circuit     one bound circuit per p
+  transpile              QAOA circuit -> AerSimulator (generic basis past its width)
+  simulator_run          SimulatorBackend.run (Aer, offline), n <= --max-sim-qubits
+  expected_energy        on the simulator counts, or on `shots` random samples
+                         when the circuit is too wide to simulate
+
+Usage (from the repository root):
+    python -m src.experiments.benchmark_pipeline --output bench.json
+    python -m src.experiments.benchmark_pipeline --sizes 8 15 24 --p 1 2 --repeat 3
+
+Requires:
+- qiskit
+- qiskit-aer
+- dimod
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from qiskit import transpile
+from src.backends.backend_simulator import SimulatorBackend
+from src.experiments.network_qaoa_sim import qubo_to_ising
+from src.qaoa.qaoa_circuit import build_qaoa_circuit
+from src.qubo.counts import Counts
+from src.qubo.network import Network
+from src.qubo.problem_network import build_network_qubo
+from src.qubo.qubo_utils import expected_energy
+
+
+# ----------------------------
+# 1) Generated networks
+# ----------------------------
+
+# (sources, sinks) -> n = sources * (sinks + 1) + sinks arc variables
+SHAPES: Dict[int, Tuple[int, int]] = {
+    8: (2, 2),
+    11: (3, 2),
+    15: (3, 3),
+    19: (4, 3),
+    24: (4, 4),
+    29: (5, 4),
+    35: (5, 5),
+}
+
+PENALTY = 30.0
+BASIS_GATES = ["cx", "rz", "rx", "h", "sx", "x", "measure"]
+
+
+def network_spec(n_vars: int, seed: int = 0):
+    n_sources, n_sinks = SHAPES[n_vars]
+    rng = np.random.default_rng(seed)
+    sources = [f"S{i}" for i in range(n_sources)]
+    sinks = {f"K{i}": 1 for i in range(n_sinks)}
+    costs = {s: float(rng.integers(1, 10)) for s in sources}
+    capacities = {s: 1 for s in sources}
+    return sources, sinks, "E", costs, capacities
+
+
+# ----------------------------
+# 2) Measurement
+# ----------------------------
+
+def measure(fn: Callable[[], object], repeat: int) -> Tuple[Dict[str, float], object]:
+    """min / median wall time over `repeat` calls and the tracemalloc peak of the first."""
+    times: List[float] = []
+    peak = 0
+    out = None
+    for k in range(repeat):
+        if k == 0:
+            tracemalloc.start()
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+        if k == 0:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    stats = {
+        "seconds_min": min(times),
+        "seconds_median": statistics.median(times),
+        "repeat": repeat,
+        "peak_bytes": peak,
+    }
+    return stats, out
+
+
+# ----------------------------
+# 3) Pipeline
+# ----------------------------
+
+def bench_size(n_vars: int, ps: List[int], shots: int, repeat: int,
+               max_sim_qubits: int, backend: SimulatorBackend) -> List[Dict]:
+    rows: List[Dict] = []
+
+    def record(stage: str, stats: Dict[str, float], **extra) -> None:
+        rows.append({"stage": stage, "n_vars": n_vars, **extra, **stats})
+
+    sources, sinks, battery, costs, capacities = network_spec(n_vars)
+
+    stats, (bqm, var_names) = measure(
+        lambda: build_network_qubo(sources, sinks, battery, costs, capacities, PENALTY), repeat)
+    record("build_network_qubo", stats)
+    assert len(var_names) == n_vars
+
+    net = Network.from_roles(sources, sinks, [battery], costs=costs, capacities=capacities)
+    stats, Q = measure(lambda: net.compile(PENALTY).to_qubo(), repeat)
+    record("compile_qubo", stats)
+
+    stats, _ = measure(lambda: qubo_to_ising(Q, n_vars), repeat)
+    record("qubo_to_ising", stats)
+
+    for p in ps:
+        params = [0.4] * (2 * p)
+        stats, qc = measure(lambda: build_qaoa_circuit(bqm, var_names, params, p), repeat)
+        record("build_qaoa_circuit", stats, p=p)
+
+        if n_vars <= backend.backend.num_qubits:
+            target, options = "aer", {"backend": backend.backend}
+        else:
+            # wider than Aer's memory-based limit: same pass manager, generic basis
+            target, options = "basis", {"basis_gates": BASIS_GATES}
+        stats, qc_t = measure(lambda: transpile(qc, **options), repeat)
+        record("transpile", stats, p=p, target=target, depth=qc_t.depth())
+
+        if n_vars <= max_sim_qubits:
+            stats, (counts, _) = measure(lambda: backend.run(qc_t, bqm, var_names), repeat)
+            record("simulator_run", stats, p=p, shots=shots)
+        else:
+            rng = np.random.default_rng(p)
+            counts = Counts.from_bits(rng.integers(0, 2, size=(shots, n_vars)))
+
+        stats, _ = measure(lambda: expected_energy(counts, bqm, var_names), repeat)
+        record("expected_energy", stats, p=p, distinct_states=len(counts))
+
+    return rows
+
+
+# ----------------------------
+# 4) Main
+# ----------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=sorted(SHAPES),
+                        help=f"Variable counts, from: {sorted(SHAPES)}")
+    parser.add_argument("--p", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--shots", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-sim-qubits", type=int, default=24,
+                        help="Widest circuit executed on Aer (statevector memory is 16 * 2^n bytes)")
+    parser.add_argument("--output", type=str, default=None, help="JSON file (default: stdout)")
+    args = parser.parse_args()
+
+    import qiskit
+    import qiskit_aer
+
+    backend = SimulatorBackend(shots=args.shots)
+    results: List[Dict] = []
+    for n_vars in args.sizes:
+        if n_vars not in SHAPES:
+            raise ValueError(f"No generated network with {n_vars} variables. Choose from: {sorted(SHAPES)}")
+        print(f"n_vars={n_vars} ...", file=sys.stderr)
+        results += bench_size(n_vars, args.p, args.shots, args.repeat, args.max_sim_qubits, backend)
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "qiskit": qiskit.__version__,
+            "qiskit_aer": qiskit_aer.__version__,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=1)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,14 @@ network_qaoa_sim.py
 Goal:
 - Build the validated 8-variable network QUBO
 - Convert QUBO -> Ising (h, J)
-- Run p=2 QAOA on Aer simulator
+- Run p=2 QAOA on Aer simulator (parametric circuit, transpiled once)
+- MIXER = "ring" / "complete": XY mixers keep every sink's inflow one-hot,
+  so far more samples are feasible
 - Compare best sampled bitstring to brute-force QUBO optimum
+- QAOA_TRACE=<prefix> writes per-stage timing spans (see src/utils/tracing.py)
+
+Run from the repository root:
+    python -m src.experiments.network_qaoa_sim
 
 Requires:
 - qiskit
@@ -15,111 +21,53 @@ Requires:
 
 from __future__ import annotations
 
-import itertools
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple
 
 import numpy as np
 from scipy.optimize import minimize
 
-from qiskit import QuantumCircuit, transpile
+from qiskit import QuantumCircuit
 from qiskit_aer import Aer
 
-from network_reference_solver import costs, var_names
+from src.experiments.network_reference_solver import build_network, var_names
+from src.qubo.counts import Counts
+from src.qubo.energy import QuboArrays
+from src.qubo.exhaustive import solve_exhaustive
+from src.qaoa.qaoa_circuit import QAOATemplate, build_ising_template, build_xy_template
+from src.utils import tracing
 
 
 # ----------------------------
 # 1) Problem definition
 # ----------------------------
 
-index = {v: i for i, v in enumerate(var_names)}
 P = 30  # penalty weight, experiments: 5, 10, 15, 20, 30, 50
+BATTERY_COST = 2.0  # battery usage penalty
+MIXER = "x"  # "x" (all 2^n states), or XY over the sink groups: "ring", "complete"
+
+# One compile pass gives the QUBO, the feasibility checker and the reference
+model = build_network(BATTERY_COST).compile(P)
+assert model.var_names == var_names
 
 
 # ----------------------------
-# 2) QUBO helpers
+# 2) QUBO + feasibility
 # ----------------------------
 
 Qubo = Dict[Tuple[int, int], float]
 
 
-def add_qubo(Q: Qubo, i: int, j: int, w: float) -> None:
-    a, b = (i, j) if i <= j else (j, i)
-    Q[(a, b)] = Q.get((a, b), 0.0) + float(w)
-
-
-def add_eq_one_constraint(Q: Qubo, vars_: List[int], P: float) -> None:
-    for i in vars_:
-        add_qubo(Q, i, i, -P)
-    for a in range(len(vars_)):
-        for b in range(a + 1, len(vars_)):
-            add_qubo(Q, vars_[a], vars_[b], 2.0 * P)
-
-
-def add_leq_one_constraint(Q: Qubo, vars_: List[int], P: float) -> None:
-    for a in range(len(vars_)):
-        for b in range(a + 1, len(vars_)):
-            add_qubo(Q, vars_[a], vars_[b], P)
-
-
-def add_battery_conservation(Q: Qubo, pos: List[int], neg: List[int], P: float) -> None:
-    for i in pos + neg:
-        add_qubo(Q, i, i, P)
+def build_qubo() -> Qubo:
+    return model.to_qubo()
 
-    for group in (pos, neg):
-        for a in range(len(group)):
-            for b in range(a + 1, len(group)):
-                add_qubo(Q, group[a], group[b], 2.0 * P)
 
-    for i in pos:
-        for j in neg:
-            add_qubo(Q, i, j, -2.0 * P)
+def is_feasible(bits) -> bool:
+    return bool(model.feasible(np.asarray(bits)[None, :])[0])
 
 
-def build_qubo() -> Qubo:
-    Q: Qubo = {}
-
-    # Costs
-    for v, c in costs.items():
-        add_qubo(Q, index[v], index[v], c)
-
-    # Sink constraints
-    add_eq_one_constraint(Q, [index["f_A_C"], index["f_B_C"], index["f_E_C"]], P)
-    add_eq_one_constraint(Q, [index["f_A_D"], index["f_B_D"], index["f_E_D"]], P)
-
-    # Source capacities
-    add_leq_one_constraint(Q, [index["f_A_C"], index["f_A_D"], index["f_A_E"]], P)
-    add_leq_one_constraint(Q, [index["f_B_C"], index["f_B_D"], index["f_B_E"]], P)
-
-    # Battery conservation
-    add_battery_conservation(
-        Q,
-        pos=[index["f_A_E"], index["f_B_E"]],
-        neg=[index["f_E_C"], index["f_E_D"]],
-        P=P,
-    )
-
-    # Battery usage penalty
-    BATTERY_COST = 2.0
-    add_qubo(Q, index["f_A_E"], index["f_A_E"], BATTERY_COST)
-    add_qubo(Q, index["f_B_E"], index["f_B_E"], BATTERY_COST)
-
-    return Q
-
-def is_feasible(bits):
-    A_out = bits[0] + bits[1] + bits[4]
-    B_out = bits[2] + bits[3] + bits[5]
-    C_in = bits[0] + bits[2] + bits[6]
-    D_in = bits[1] + bits[3] + bits[7]
-    E_in = bits[4] + bits[5]
-    E_out = bits[6] + bits[7]
-
-    return (
-        A_out <= 1 and
-        B_out <= 1 and
-        C_in == 1 and
-        D_in == 1 and
-        E_in == E_out
-    )
+def feasible_mask(X: np.ndarray) -> np.ndarray:
+    """Vectorized is_feasible over a (S, n) bit matrix."""
+    return model.feasible(X)
 
 
 # ----------------------------
@@ -131,15 +79,10 @@ def qubo_energy(bits: Tuple[int, ...], Q: Qubo) -> float:
 
 
 def brute_force_best(Q: Qubo, n: int) -> Tuple[float, Tuple[int, ...]]:
-    best_e = float("inf")
-    best_bits = None
-    for bits in itertools.product([0, 1], repeat=n):
-        e = qubo_energy(bits, Q)
-        if e < best_e:
-            best_e = e
-            best_bits = bits
+    res = solve_exhaustive(QuboArrays.from_qubo(Q, n), feasible=feasible_mask)
+    best_e, best_bits = res.best
     print("Feasible?", is_feasible(best_bits))
-    return best_e, best_bits  # type: ignore
+    return best_e, best_bits
 
 
 # ----------------------------
@@ -168,39 +111,16 @@ def qubo_to_ising(Q: Qubo, n: int):
 # 5) QAOA p=2 circuit
 # ----------------------------
 
-def build_qaoa_circuit_p2(
-    n: int,
-    h: np.ndarray,
-    J: Dict[Tuple[int, int], float],
-    gamma1: float,
-    beta1: float,
-    gamma2: float,
-    beta2: float,
-) -> QuantumCircuit:
-
-    qc = QuantumCircuit(n, n)
-    qc.h(range(n))
-
-    # Layer 1
-    for i in range(n):
-        if abs(h[i]) > 1e-12:
-            qc.rz(2 * gamma1 * h[i], i)
-    for (i, j), Jij in J.items():
-        qc.rzz(2 * gamma1 * Jij, i, j)
-    for i in range(n):
-        qc.rx(2 * beta1, i)
-
-    # Layer 2
-    for i in range(n):
-        if abs(h[i]) > 1e-12:
-            qc.rz(2 * gamma2 * h[i], i)
-    for (i, j), Jij in J.items():
-        qc.rzz(2 * gamma2 * Jij, i, j)
-    for i in range(n):
-        qc.rx(2 * beta2, i)
-
-    qc.measure(range(n), range(n))
-    return qc
+def build_qaoa_template_p2(h: np.ndarray, J: Dict[Tuple[int, int], float]) -> QAOATemplate:
+    """Parametric p=2 ansatz; transpile once, bind (gamma, beta) per evaluation."""
+    if MIXER != "x":
+        return build_xy_template(model.bqm(), var_names, model.one_hot_groups(), p=2, mixer=MIXER)
+    return build_ising_template(h, J, p=2)
+
+
+def bind_p2(template: QAOATemplate, gb: np.ndarray, backend) -> QuantumCircuit:
+    gamma1, beta1, gamma2, beta2 = map(float, gb)
+    return template.bind([gamma1, gamma2, beta1, beta2], backend)
 
 
 # ----------------------------
@@ -215,6 +135,8 @@ def main():
     ref_bitstring = "".join(map(str, ref_bits))
 
     _, h, J = qubo_to_ising(Q, n)
+    arrays = QuboArrays.from_qubo(Q, n, var_names)
+    template = build_qaoa_template_p2(h, J)
 
     backend = Aer.get_backend("aer_simulator")
     shots = 8192 # Experiments: 56, 512, 1024, 2048, 4096, 8192
@@ -222,18 +144,13 @@ def main():
     def expected_qubo_energy(gb: np.ndarray) -> float:
         gamma1, beta1, gamma2, beta2 = map(float, gb)
 
-        qc = build_qaoa_circuit_p2(
-            n, h, J, gamma1, beta1, gamma2, beta2
-        )
-        qc_t = transpile(qc, backend)
-        result = backend.run(qc_t, shots=shots).result()
-        counts = result.get_counts()
-
-        total = sum(counts.values())
-        e = 0.0
-        for bitstr, cnt in counts.items():
-            bits = tuple(int(b) for b in bitstr[::-1])
-            e += (cnt / total) * qubo_energy(bits, Q)
+        with tracing.span("objective", p=2):
+            qc_t = bind_p2(template, gb, backend)
+            with tracing.span("execute", backend="aer", shots=shots):
+                result = backend.run(qc_t, shots=shots).result()
+            with tracing.span("decode"):
+                counts = Counts.from_dict(result.get_counts(), n)
+                e = arrays.expected(counts)
 
         print(
             f"gamma1={gamma1:.3f}, beta1={beta1:.3f}, "
@@ -252,13 +169,11 @@ def main():
 
     print("\nOptimal parameters:", res.x)
 
-    gamma1, beta1, gamma2, beta2 = res.x
-    qc = build_qaoa_circuit_p2(n, h, J, gamma1, beta1, gamma2, beta2)
-    qc_t = transpile(qc, backend)
-    counts = backend.run(qc_t, shots=shots).result().get_counts()
+    qc_t = bind_p2(template, res.x, backend)
+    counts = Counts.from_dict(backend.run(qc_t, shots=shots).result().get_counts(), n)
 
-    def bitstr_to_bits(bitstr: str) -> tuple[int, ...]:
-        return tuple(int(b) for b in bitstr[::-1])
+    bit_rows, cnts = counts.bits(), counts.weights
+    energies = arrays.energies(bit_rows)
 
     best_feasible = None
     best_feasible_E = float("inf")
@@ -268,9 +183,9 @@ def main():
     best_any_E = float("inf")
     best_any_count = 0
 
-    for bitstr, cnt in counts.items():
-        bits = bitstr_to_bits(bitstr)
-        E = qubo_energy(bits, Q)
+    for row, cnt, E in zip(bit_rows, cnts, energies):
+        bits = tuple(int(b) for b in row)
+        cnt = int(cnt)
 
         if E < best_any_E:
             best_any_E = E
@@ -297,11 +212,11 @@ def main():
             [var_names[i] for i,b in enumerate(best_feasible) if b])
 
 
-    best = max(counts, key=counts.get)[::-1]
-    bits = tuple(int(b) for b in best)
+    bits = tuple(int(b) for b in counts.top(1).bits()[0])
+    best = "".join(map(str, bits))
 
     print("\nMost frequent bitstring:", best)
-    print("QUBO energy:", qubo_energy(bits, Q))
+    print("QUBO energy:", arrays.energies(bits))
     print("Active flows:", [var_names[i] for i, b in enumerate(bits) if b])
     print("\nMatch reference?", best == ref_bitstring)
 
@@ -3,10 +3,13 @@ QUBO construction for ultra-simple network flow problem.
 
 This QUBO is mathematically equivalent to the classical reference solver
 and is used as input for QAOA / quantum backends.
+
+Run from the repository root: python -m src.experiments.network_qubo_builder
 """
 
-import itertools
-from network_reference_solver import var_names, costs
+from src.experiments.network_reference_solver import var_names, costs
+from src.qubo.energy import QuboArrays
+from src.qubo.exhaustive import solve_exhaustive
 
 # ----------------------------
 # Variable indexing
@@ -111,21 +114,7 @@ Q[(index["f_B_E"], index["f_B_E"])] += 0.5
 # ----------------------------
 # 6. Brute-force validation
 # ----------------------------
-def qubo_energy(bits):
-    E = 0.0
-    for (i, j), w in Q.items():
-        E += w * bits[i] * bits[j]
-    return E
-
-
-best_E = float("inf")
-best_bits = None
-
-for bits in itertools.product([0, 1], repeat=n):
-    E = qubo_energy(bits)
-    if E < best_E:
-        best_E = E
-        best_bits = bits
+best_E, best_bits = solve_exhaustive(QuboArrays.from_qubo(Q, n, var_names)).best
 
 print("\n=== QUBO brute-force check ===")
 print("Best QUBO energy:", best_E)
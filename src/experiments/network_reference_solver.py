@@ -29,27 +29,47 @@ Goal:
 
 # Reference classical solver
 # Used to validate all quantum results
+# Run from the repository root: python -m src.experiments.network_reference_solver
 
-import itertools
+import numpy as np
 
-var_names = [
-    "f_A_C", "f_A_D",
-    "f_B_C", "f_B_D",
-    "f_A_E", "f_B_E",
-    "f_E_C", "f_E_D",
-]
+from src.qubo.exhaustive import all_states
+from src.qubo.network import Network
+
+P = 50  # penalty weight
+BATTERY_COST = 0.5  # battery usage penalty (soft bias)
+
+
+def build_network(battery_cost: float = BATTERY_COST) -> Network:
+    return Network.from_roles(
+        sources=["A", "B"],
+        sinks={"C": 1, "D": 1},
+        batteries=["E"],
+        arcs=[
+            ("A", "C"), ("A", "D"),
+            ("B", "C"), ("B", "D"),
+            ("A", "E"), ("B", "E"),
+            ("E", "C"), ("E", "D"),
+        ],
+        costs={"A": 2, "B": 3},
+        capacities={"A": 1, "B": 1},
+        usage_costs={"E": battery_cost},
+    )
+
+
+network = build_network()
+
+var_names = [f"f_{t}_{h}" for t, h, _ in network.arcs]
 
 costs = {
-    "f_A_C": 2,
-    "f_A_D": 2,
-    "f_A_E": 2,
-    "f_B_C": 3,
-    "f_B_D": 3,
-    "f_B_E": 3,
+    f"f_{t}_{h}": network.nodes[t].cost
+    for t, h, _ in network.arcs
+    if network.nodes[t].role == "source"
 }
 
-P = 50  # penalty weight
 
+# Reported reference: the original penalty form, kept independent of the
+# compiled model's QUBO so that QUBO is validated against it
 def cost_term(sample):
     return sum(c * sample[v] for v, c in costs.items())
 
@@ -61,12 +81,12 @@ def sink_penalty(sample):
 def source_penalty(sample):
     A_out = sample["f_A_C"] + sample["f_A_D"] + sample["f_A_E"]
     B_out = sample["f_B_C"] + sample["f_B_D"] + sample["f_B_E"]
-    return P * max(0, A_out - 1)**2 + P * max(0, B_out - 1)**2
+    return P * np.maximum(0, A_out - 1)**2 + P * np.maximum(0, B_out - 1)**2
 
 def battery_penalty(sample):
     E_in = sample["f_A_E"] + sample["f_B_E"]
     E_out = sample["f_E_C"] + sample["f_E_D"]
-    return P * (E_in - E_out)**2 + 0.5 * (sample["f_A_E"] + sample["f_B_E"])
+    return P * (E_in - E_out)**2 + BATTERY_COST * (sample["f_A_E"] + sample["f_B_E"])
 
 def energy(sample):
     return (
@@ -78,16 +98,14 @@ def energy(sample):
 
 
 if __name__ == "__main__":
-    best_E = float("inf")
-    best_sample = None
+    # Penalty form is not quadratic (max(0, .)^2), so score every assignment
+    # at once on column arrays instead of through the QUBO solver
+    X = all_states(len(var_names)).astype(np.int64)
+    E = energy({v: X[:, i] for i, v in enumerate(var_names)})
 
-    for bits in itertools.product([0, 1], repeat=len(var_names)):
-        sample = dict(zip(var_names, bits))
-        E = energy(sample)
-
-        if E < best_E:
-            best_E = E
-            best_sample = sample
+    k = int(np.argmin(E))
+    best_E = float(E[k])
+    best_sample = {v: int(X[k, i]) for i, v in enumerate(var_names)}
 
     print("Best energy:", best_E)
     print("Best solution:")
@@ -98,10 +116,6 @@ if __name__ == "__main__":
     print("\nTotal cost:", cost_term(best_sample))
 
     print("\nConstraint check:")
-    print("A out:", best_sample["f_A_C"] + best_sample["f_A_D"] + best_sample["f_A_E"])
-    print("B out:", best_sample["f_B_C"] + best_sample["f_B_D"] + best_sample["f_B_E"])
-    print("C in:", best_sample["f_A_C"] + best_sample["f_B_C"] + best_sample["f_E_C"])
-    print("D in:", best_sample["f_A_D"] + best_sample["f_B_D"] + best_sample["f_E_D"])
-    print("E in:", best_sample["f_A_E"] + best_sample["f_B_E"])
-    print("E out:", best_sample["f_E_C"] + best_sample["f_E_D"])
-
+    model = network.compile(P)
+    for node, (value, target, ok) in model.check(X[k]).items():
+        print(f"{node}: {value:g} / {target:g}", "✓" if ok else "✗")
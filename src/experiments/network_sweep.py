@@ -0,0 +1,91 @@
+"""
+network_sweep.py
+
+Goal:
+- Replace the manual P / shots edits of network_qaoa_sim.py with one grid
+  over penalty weight, shots, QAOA depth, seed and backend
+- Build each penalty's QUBO / Ising / reference once, run cells in parallel
+- Store every finished cell immediately; rerunning resumes the sweep
+
+Usage (from the repository root):
+    python -m src.experiments.network_sweep --penalties 5 10 15 20 30 50 --shots 512 2048 8192
+    python -m src.experiments.network_sweep --backends sv sim --p 1 2 --seeds 0 1 2 --store sweep_results
+
+Requires:
+- qiskit
+- qiskit-aer
+- scipy
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Dict
+
+import numpy as np
+
+from src.experiments.network_reference_solver import build_network
+from src.qaoa.sweep import SweepStore, run_sweep, sweep_grid
+
+
+# ----------------------------
+# 1) CLI
+# ----------------------------
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--penalties", type=float, nargs="+", default=[5, 10, 15, 20, 30, 50])
+    parser.add_argument("--shots", type=int, nargs="+", default=[512, 2048, 8192])
+    parser.add_argument("--p", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0])
+    parser.add_argument("--backends", type=str, nargs="+", default=["sim"],
+                        help="Any get_backend name: sim | sv | sa | tabu | fake | ionq | iqm")
+    parser.add_argument("--mixers", type=str, nargs="+", default=["x"],
+                        help="x | ring | complete (XY over the sink groups, as MIXER in network_qaoa_sim)")
+    parser.add_argument("--battery-cost", type=float, default=2.0)
+    parser.add_argument("--maxiter", type=int, default=30)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--store", type=str, default="sweep_results")
+    return parser.parse_args()
+
+
+# ----------------------------
+# 2) Sweep
+# ----------------------------
+
+def main() -> None:
+    args = parse_args()
+    network = build_network(args.battery_cost)
+    models: Dict[float, object] = {float(P): network.compile(P) for P in args.penalties}
+
+    cells = sweep_grid(args.penalties, args.shots, args.p, args.seeds, args.backends, args.mixers)
+    store = SweepStore(args.store)
+    print(f"{len(cells)} cells, {len(store)} already stored in {args.store}")
+
+    def report(row: Dict) -> None:
+        print(f"{row['key']}: E={row['energy']:.3f} "
+              f"p_feasible={row['p_feasible']:.3f} p_optimal={row['p_optimal']:.3f} "
+              f"({row['seconds']:.1f} s)")
+
+    ran = run_sweep(models, cells, store, processes=args.processes,
+                    maxiter=args.maxiter, callback=report)
+    print(f"Ran {ran} cells")
+
+    # ----------------------------
+    # 3) Summary: mean over seeds
+    # ----------------------------
+    data = store.load()
+    if not data:
+        return
+    print("\nbackend  mixer        P  p  shots  p_feasible  p_optimal  energy")
+    groups = sorted({(b, x, P, p, s) for b, x, P, p, s in
+                     zip(data["backend"], data["mixer"], data["P"], data["p"], data["shots"])})
+    for b, x, P, p, s in groups:
+        m = ((data["backend"] == b) & (data["mixer"] == x) & (data["P"] == P)
+             & (data["p"] == p) & (data["shots"] == s))
+        print(f"{b:8s} {x:8s} {P:5g} {p:2d} {s:6d}  {np.mean(data['p_feasible'][m]):10.3f} "
+              f"{np.mean(data['p_optimal'][m]):10.3f} {np.mean(data['energy'][m]):8.3f}")
+
+
+if __name__ == "__main__":
+    main()
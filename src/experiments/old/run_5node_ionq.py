@@ -6,6 +6,9 @@ import dimod
 
 load_dotenv()
 
+from src.qubo.counts import Counts
+from src.qubo.energy import QuboArrays
+
 # CONFIGURATION
 IONQ_API_KEY = os.getenv("IONQ_API_KEY")
 if not IONQ_API_KEY:
@@ -61,6 +64,7 @@ for src in sources:
 # Build BQM
 bqm = dimod.BinaryQuadraticModel(linear, quadratic, 0.0, dimod.BINARY)
 print(f"Built BQM: {len(bqm.linear)} linear, {len(bqm.quadratic)} quadratic terms\n")
+energy_arrays = QuboArrays.from_bqm(bqm, var_names)
 
 # CONNECT TO IONQ
 from qiskit_ionq import IonQProvider
@@ -117,14 +121,7 @@ def build_qaoa_circuit(params):
 # ENERGY EVALUATION ON IONQ
 def energy_from_counts(counts):
     """Calculate expected energy from measurement counts"""
-    total = sum(counts.values())
-    avg_energy = 0.0
-    for bitstr, cnt in counts.items():
-        # Convert bitstring to variable assignment
-        sample = {v: int(bitstr[i]) for i, v in enumerate(var_names)}
-        e = bqm.energy(sample)
-        avg_energy += (cnt / total) * e
-    return avg_energy
+    return energy_arrays.expected(counts)
 
 def hardware_eval(params):
     """Evaluate energy on IonQ hardware"""
@@ -136,7 +133,7 @@ def hardware_eval(params):
     # Run on IonQ
     job = backend.run(qc_transpiled, shots=shots)
     result = job.result()
-    counts = result.get_counts()
+    counts = Counts.from_dict(result.get_counts(), n_qubits)
     
     energy = energy_from_counts(counts)
     print(f"  params: {[round(float(x), 4) for x in params]} -> energy: {round(energy, 4)}")
@@ -165,13 +162,14 @@ final_qc_transpiled = transpile(final_qc, backend=backend, optimization_level=1)
 
 job = backend.run(final_qc_transpiled, shots=shots)
 final_result = job.result()
-counts = final_result.get_counts()
+counts = Counts.from_dict(final_result.get_counts(), n_qubits)
 
 print(f"Final counts: {counts}\n")
 
 # Get best bitstring
-best_bitstring = max(counts, key=counts.get)
-best_sample = {v: int(best_bitstring[i]) for i, v in enumerate(var_names)}
+top = counts.top(1)
+best_bitstring = next(iter(top))
+best_sample = {v: int(b) for v, b in zip(var_names, top.bits()[0])}
 best_energy = bqm.energy(best_sample)
 
 # DISPLAY RESULTS
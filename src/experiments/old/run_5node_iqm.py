@@ -6,6 +6,9 @@ from scipy.optimize import minimize
 
 load_dotenv()
 
+from src.qubo.counts import Counts
+from src.qubo.energy import QuboArrays
+
 IQM_SERVER_URL = os.getenv("IQM_SERVER_URL") or os.getenv("SERVER_URL")
 IQM_API_TOKEN = os.getenv("IQM_API_TOKEN") or os.getenv("RESONANCE_API_TOKEN")
 
@@ -84,6 +87,7 @@ for v1, v2 in itertools.combinations(incoming_to_bat + outgoing_from_bat, 2):
 
 bqm = dimod.BinaryQuadraticModel(linear, quadratic, 0.0, dimod.BINARY)
 print("Built BQM:", len(bqm.linear), "linear terms;", len(bqm.quadratic), "quadratic terms")
+energy_arrays = QuboArrays.from_bqm(bqm, var_names)
 
 # IQM connection
 from iqm.qiskit_iqm import IQMProvider, transpile_to_IQM
@@ -128,20 +132,14 @@ def build_qaoa_circuit(params):
 
 # energy estimation function using hardware counts
 def energy_from_counts(counts):
-    total = sum(counts.values())
-    avg = 0.0
-    for bitstr, cnt in counts.items():
-        sample = {v: int(bitstr[i]) for i, v in enumerate(var_names)}
-        e = bqm.energy(sample)
-        avg += (cnt / total) * e
-    return avg
+    return energy_arrays.expected(counts)
 
 def hardware_eval(params):
     qc = build_qaoa_circuit(params)
     qc_iqm = transpile_to_IQM(qc, backend)
     job = backend.run(qc_iqm, shots=shots)
     res = job.result()
-    counts = res.get_counts()
+    counts = Counts.from_dict(res.get_counts(), n_qubits)
     e = energy_from_counts(counts)
     print("params:", [round(float(x), 4) for x in params], "-> energy:", round(e, 4))
     return e
@@ -160,11 +158,12 @@ final_qc = build_qaoa_circuit(best_params)
 final_qc_iqm = transpile_to_IQM(final_qc, backend)
 job = backend.run(final_qc_iqm, shots=shots)
 res_final = job.result()
-counts = res_final.get_counts()
+counts = Counts.from_dict(res_final.get_counts(), n_qubits)
 print("\nFinal counts:", counts)
 
-best_bs = max(counts, key=counts.get)
-best_sample = {v: int(best_bs[i]) for i, v in enumerate(var_names)}
+top = counts.top(1)
+best_bs = next(iter(top))
+best_sample = {v: int(b) for v, b in zip(var_names, top.bits()[0])}
 print("\nBest measured bitstring:", best_bs)
 print("Energy:", bqm.energy(best_sample))
 
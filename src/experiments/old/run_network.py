@@ -1,12 +1,24 @@
 import argparse
+import sys
+
+import numpy as np
 from scipy.optimize import minimize
 
 from dotenv import load_dotenv
 load_dotenv()
 
+from src.qubo.energy import QuboArrays
+from src.qubo.presolve import presolve
 from src.qubo.problem_network import build_network_qubo
-from src.qaoa.qaoa_circuit import build_qaoa_circuit
+from src.qaoa.qaoa_circuit import build_qaoa_template, supports_rzz
 from src.backends import get_backend
+from src.backends.cache import CachedBackend, ResultCache
+from src.backends.executor import JobExecutor
+from src.qaoa.gradients import objective_with_gradient, adam
+from src.qaoa.layout import LayoutManager, RoutedTemplate
+from src.qaoa.warmstart import ParameterStore
+from src.qaoa.shots import AdaptiveShots
+from src.utils import tracing
 
 # ----------------------------
 # CLI
@@ -16,11 +28,66 @@ parser.add_argument(
     "--backend",
     type=str,
     default="sim",
-    help="Backend: sim | ionq | iqm"
+    help="Backend: sim | sv | ionq | iqm"
+)
+parser.add_argument(
+    "--optimizer",
+    type=str,
+    default="cobyla",
+    help="Optimizer: cobyla | lbfgs | adam (gradient-based use adjoint/parameter-shift gradients)"
+)
+parser.add_argument(
+    "--cache",
+    type=str,
+    default=None,
+    help="SQLite file caching executions; identical circuits never run twice"
+)
+parser.add_argument(
+    "--replay",
+    action="store_true",
+    help="Serve only from --cache, never execute (fails on cache miss)"
+)
+parser.add_argument(
+    "--adaptive-shots",
+    action="store_true",
+    help="COBYLA only: start with few shots and raise them as optimizer steps shrink"
+)
+parser.add_argument(
+    "--params-store",
+    type=str,
+    default=None,
+    help="JSON file of optimized angles; warm-starts similar problems and deeper p"
+)
+parser.add_argument(
+    "--presolve",
+    action="store_true",
+    help="Fix / merge variables implied by the QUBO before building the circuit (fewer qubits)"
+)
+parser.add_argument(
+    "--layout-cache",
+    type=str,
+    default=None,
+    help="Directory of routed circuits per problem structure and device; later runs skip layout/routing"
+)
+parser.add_argument(
+    "--in-flight",
+    type=int,
+    default=4,
+    help="lbfgs/adam with parameter shift: shifted-circuit jobs kept in flight at once"
+)
+parser.add_argument(
+    "--trace",
+    type=str,
+    default=None,
+    help="Record per-stage timing spans; writes TRACE.jsonl and TRACE.trace.json (Chrome trace)"
 )
 args = parser.parse_args()
+if args.trace:
+    tracing.enable()
 
 backend = get_backend(args.backend)
+if args.cache:
+    backend = CachedBackend(backend, ResultCache(args.cache, readonly=args.replay))
 print(f"Using backend: {args.backend}")
 
 # ----------------------------
@@ -48,37 +115,107 @@ bqm, var_names = build_network_qubo(
 p = 1
 shots = 512
 
+def print_sample(sample):
+    print("Energy:", bqm.energy(sample))
+    print("\nActive flows:")
+    for v, val in sample.items():
+        if val == 1:
+            print(" ", v)
+
+pre = None
+qaoa_bqm, qaoa_vars = bqm, var_names
+if args.presolve:
+    pre = presolve(QuboArrays.from_bqm(bqm, var_names))
+    print("Presolve:", pre.summary())
+    if pre.n == 0:
+        print("\nEvery variable fixed by presolve, nothing left for QAOA")
+        print_sample(dict(zip(var_names, pre.expand(np.zeros((1, 0)))[0].tolist())))
+        sys.exit(0)
+    qaoa_bqm, qaoa_vars = pre.bqm(), pre.var_names
+
+# Innermost provider device, through wrappers such as CachedBackend
+device = backend
+while hasattr(device, "backend"):
+    device = device.backend
+
+template = build_qaoa_template(
+    qaoa_bqm, qaoa_vars, p,
+    native_rzz=supports_rzz(device)
+)
+if args.layout_cache:
+    template = RoutedTemplate(template, LayoutManager(args.layout_cache))
+
 def objective(params):
-    qc = build_qaoa_circuit(bqm, var_names, params, p)
-    _, E = backend.run(qc, bqm, var_names)
+    with tracing.span("objective", p=p):
+        _, E = backend.run_template(template, params)
     print("params:", params, "-> E:", round(E, 4))
     return E
 
 init = [0.4] * (2 * p)
+store = ParameterStore(args.params_store) if args.params_store else None
+if store is not None:
+    init = store.initial_point(template.arrays, p, default=init)
+    print("Initial parameters:", init)
+
+maxiter = 6 if args.backend not in ("sim", "sv") else 20
+
+def report(params, E):
+    print("params:", params, "-> E:", round(E, 4))
+
+# Parameter-shift gradients submit their 2K+1 circuits as concurrent jobs
+executor = None
+if args.optimizer in ("lbfgs", "adam") and not hasattr(backend, "expectation_and_gradient"):
+    executor = JobExecutor(backend, max_in_flight=args.in_flight)
 
 print("Starting optimization...")
-res = minimize(
-    objective,
-    init,
-    method="COBYLA",
-    options={"maxiter": 6 if args.backend != "sim" else 20}
-)
+if args.optimizer == "cobyla":
+    if args.adaptive_shots:
+        objective = AdaptiveShots(
+            backend, template,
+            callback=lambda params, E, n: print("params:", params, "-> E:", round(E, 4), f"({n} shots)")
+        )
+    res = minimize(
+        objective,
+        init,
+        method="COBYLA",
+        options={"maxiter": maxiter}
+    )
+elif args.optimizer == "lbfgs":
+    res = minimize(
+        objective_with_gradient(backend, template, report, executor),
+        init,
+        jac=True,
+        method="L-BFGS-B",
+        options={"maxiter": maxiter}
+    )
+elif args.optimizer == "adam":
+    res = adam(objective_with_gradient(backend, template, report, executor), init, maxiter=maxiter)
+else:
+    raise ValueError(f"Unknown optimizer '{args.optimizer}'. Choose from: cobyla | lbfgs | adam")
+if executor is not None:
+    executor.shutdown()
 
 print("\nOptimal parameters:", res.x)
+if isinstance(objective, AdaptiveShots):
+    print("Shots:", objective.summary())
+if store is not None:
+    store.put(template.arrays, p, res.x, res.fun)
 
 # ----------------------------
 # Final run & decode
 # ----------------------------
-qc = build_qaoa_circuit(bqm, var_names, res.x, p)
-counts, E = backend.run(qc, bqm, var_names)
+counts, E = backend.run_template(template, res.x)
+if pre is not None:
+    counts = pre.expand_counts(counts)     # back to the full var_names
 
-best = max(counts, key=counts.get)
-sample = {var_names[i]: int(best[i]) for i in range(len(var_names))}
+top = counts.top(1)
+best = next(iter(top))
+sample = {v: int(b) for v, b in zip(var_names, top.bits()[0])}
 
 print("\nBest bitstring:", best)
-print("Energy:", bqm.energy(sample))
+print_sample(sample)
 
-print("\nActive flows:")
-for v, val in sample.items():
-    if val == 1:
-        print(" ", v)
+if args.trace:
+    print("\nTiming (calls, seconds):")
+    for name, (calls, seconds) in tracing.export(args.trace).items():
+        print(f"  {name}: {calls} x, {seconds:.3f} s")
@@ -0,0 +1,144 @@
+"""
+QAOA gradients (adjoint on the statevector backend, parameter shift
+elsewhere) and gradient-based optimizers; see objective_with_gradient.
+"""
+
+import numpy as np
+from qiskit import QuantumCircuit, transpile
+from qiskit.circuit import ParameterExpression, ParameterVector
+from scipy.optimize import OptimizeResult
+
+from src.utils import tracing
+
+SHIFT = np.pi / 2
+
+
+class ParameterShift:
+    def __init__(self, template):
+        self.template = template
+        logical = list(template.gammas) + list(template.betas)
+        index = {prm: i for i, prm in enumerate(logical)}
+
+        src = template.circuit
+        exprs = [
+            inst.operation.params[0] for inst in src.data
+            if inst.operation.params
+            and isinstance(inst.operation.params[0], ParameterExpression)
+            and inst.operation.params[0].parameters
+        ]
+        self.thetas = ParameterVector("theta", len(exprs))
+
+        # jacobian[k, j] = d theta_k / d logical_j; template angles are
+        # c * param with no offset, so theta = jacobian @ params
+        self.jacobian = np.zeros((len(exprs), len(logical)))
+        for k, expr in enumerate(exprs):
+            for prm in expr.parameters:
+                self.jacobian[k, index[prm]] = float(expr.gradient(prm))
+
+        qc = QuantumCircuit(*src.qregs, *src.cregs)
+        k = 0
+        for inst in src.data:
+            op = inst.operation
+            if op.params and isinstance(op.params[0], ParameterExpression) and op.params[0].parameters:
+                op = op.copy()
+                op.params = [self.thetas[k]]
+                k += 1
+            qc.append(op, inst.qubits, inst.clbits)
+        self.circuit = qc
+        self.arrays = template.arrays
+        self._transpiled = {}
+
+    def angles(self, params):
+        """Per-gate angles theta for a logical parameter vector."""
+        return self.jacobian @ np.asarray(params, dtype=float)
+
+    def shifted_angles(self, params):
+        """The 2K shifted angle vectors: [theta + s e_0, theta - s e_0, theta + s e_1, ...]."""
+        theta = self.angles(params)
+        out = []
+        for k in range(len(theta)):
+            for sign in (1, -1):
+                shifted = theta.copy()
+                shifted[k] += sign * SHIFT
+                out.append(shifted)
+        return out
+
+    def bind(self, theta, backend=None, **transpile_options):
+        """Executable expanded circuit for one angle vector (template interface)."""
+        if backend is not None and hasattr(self.template, "bind_angles"):
+            # RoutedTemplate: its cached skeleton has this same theta layout
+            return self.template.bind_angles(theta, backend, **transpile_options)
+        qc = self.circuit
+        if backend is not None:
+            key = (id(backend), tuple(sorted((k, repr(v)) for k, v in transpile_options.items())))
+            if key not in self._transpiled:
+                with tracing.span("transpile", qubits=qc.num_qubits, shift_gates=len(self.thetas)):
+                    self._transpiled[key] = (backend, transpile(qc, backend=backend, **transpile_options))
+            qc = self._transpiled[key][1]
+        return qc.assign_parameters(dict(zip(self.thetas, theta)), inplace=False)
+
+    def combine(self, energies):
+        """Logical gradient from the 2K shifted energies (order as in shifted_angles())."""
+        energies = np.asarray(energies, dtype=float).reshape(-1, 2)
+        return self.jacobian.T @ ((energies[:, 0] - energies[:, 1]) / 2)
+
+
+def objective_with_gradient(backend, template, callback=None, executor=None, chunk=2):
+    """
+    fun(params) -> (energy, gradient) for `backend`.
+
+    Exact adjoint gradient when the backend provides expectation_and_gradient
+    (statevector); otherwise parameter shift, batched through backend.run_batch.
+    With a JobExecutor the 2K+1 shifted circuits are split into jobs of
+    `chunk` parameter sets that are all in flight at once.
+    """
+    if hasattr(backend, "expectation_and_gradient"):
+        def fun(params):
+            e, g = backend.expectation_and_gradient(template, params)
+            if callback is not None:
+                callback(params, e)
+            return e, g
+        return fun
+
+    shift = ParameterShift(template)
+
+    def evaluate(param_sets):
+        if executor is None:
+            return backend.run_batch(shift, param_sets)[1]
+        futures = [executor.submit(shift, param_sets[i:i + chunk])
+                   for i in range(0, len(param_sets), chunk)]
+        return [e for future in futures for e in future.result()[1]]
+
+    def fun(params):
+        # Batch 0 = the energy itself, as theta is the unshifted angle vector
+        energies = evaluate([shift.angles(params)] + shift.shifted_angles(params))
+        e, g = energies[0], shift.combine(energies[1:])
+        if callback is not None:
+            callback(params, e)
+        return e, g
+
+    return fun
+
+
+def adam(fun, x0, lr=0.05, maxiter=100, beta1=0.9, beta2=0.999, eps=1e-8, tol=1e-6):
+    """Adam on fun(x) -> (value, grad); returns a scipy OptimizeResult."""
+    x = np.asarray(x0, dtype=float).copy()
+    m = np.zeros_like(x)
+    v = np.zeros_like(x)
+    best_x, best_f = x.copy(), np.inf
+    nfev = 0
+
+    for t in range(1, maxiter + 1):
+        f, g = fun(x)
+        nfev += 1
+        if f < best_f:
+            best_x, best_f = x.copy(), f
+        m = beta1 * m + (1 - beta1) * g
+        v = beta2 * v + (1 - beta2) * g * g
+        step = lr * (m / (1 - beta1 ** t)) / (np.sqrt(v / (1 - beta2 ** t)) + eps)
+        x = x - step
+        if np.linalg.norm(step) < tol:
+            break
+
+    return OptimizeResult(x=best_x, fun=best_f, nfev=nfev, nit=t,
+                          success=True, message="Adam finished")
@@ -0,0 +1,191 @@
+"""
+Hardware-aware layout plus an on-disk QPY cache of routed per-gate-angle
+skeletons, keyed by the gates a template emits and the device, so later
+runs skip layout and routing.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+from qiskit import qpy, transpile
+
+from src.qaoa.gradients import ParameterShift
+from src.utils import tracing
+
+FORMAT = 3
+
+
+def coupling_map_of(backend):
+    """The device CouplingMap, or None for all-to-all devices (IonQ, simulators)."""
+    target = getattr(backend, "target", None)
+    if target is not None:
+        cmap = target.build_coupling_map()
+        if cmap is not None:
+            return cmap
+    cmap = getattr(backend, "coupling_map", None)
+    return cmap if cmap is not None and not callable(cmap) else None
+
+
+def device_name(backend):
+    name = getattr(backend, "name", None)
+    if callable(name):
+        name = name()
+    return str(name or type(backend).__name__)
+
+
+def structure(circuit):
+    """
+    (n, gate sequence, sorted two-qubit interactions) of the gates `circuit`
+    actually emits; the sequence holds (name, qubit indices) per instruction.
+    """
+    index = {q: i for i, q in enumerate(circuit.qubits)}
+    gates = [(inst.operation.name, [index[q] for q in inst.qubits]) for inst in circuit.data]
+    edges = {tuple(sorted(qubits)) for _, qubits in gates if len(qubits) == 2}
+    return circuit.num_qubits, gates, sorted(edges)
+
+
+def two_qubit_count(qc):
+    return sum(1 for inst in qc.data if len(inst.qubits) == 2)
+
+
+def initial_layout(n, edges, cmap):
+    """Physical qubit per logical qubit, or None when the device is all-to-all."""
+    if cmap is None:
+        return None
+    D = np.asarray(cmap.distance_matrix, dtype=float)
+    if n > len(D):
+        raise ValueError(f"{n} logical qubits do not fit on a {len(D)}-qubit device")
+
+    nbrs = [[] for _ in range(n)]
+    for i, j in edges:
+        nbrs[i].append(j)
+        nbrs[j].append(i)
+    centrality = D.sum(axis=1)
+
+    phys = {}
+    free = set(range(len(D)))
+    while len(phys) < n:
+        # logical qubit with the most placed neighbours, then the highest degree
+        q = max((q for q in range(n) if q not in phys),
+                key=lambda q: (sum(v in phys for v in nbrs[q]), len(nbrs[q]), -q))
+        placed = [phys[v] for v in nbrs[q] if v in phys]
+        cost = lambda c: (sum(D[c, p] for p in placed), centrality[c], c)
+        phys[q] = min(free, key=cost)
+        free.remove(phys[q])
+    return [phys[q] for q in range(n)]
+
+
+class LayoutManager:
+    def __init__(self, cache_dir=".layout_cache", seed=0):
+        self.cache_dir = cache_dir
+        self.seed = seed
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._shifts = {}
+        self._skeletons = {}
+
+    def key(self, template, backend, transpile_options):
+        n, gates, _ = structure(self.shift(template).circuit)
+        cmap = coupling_map_of(backend)
+        payload = {
+            "format": FORMAT,
+            "n": n, "gates": gates, "p": template.p,
+            "tol": getattr(template, "tol", None),
+            "device": device_name(backend),
+            "coupling": sorted(map(list, cmap.get_edges())) if cmap is not None else None,
+            "transpile": sorted((k, repr(v)) for k, v in transpile_options.items()),
+            "seed": self.seed,
+        }
+        return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+    def shift(self, template):
+        key = id(template)
+        if key not in self._shifts:
+            self._shifts[key] = (template, ParameterShift(template))
+        return self._shifts[key][1]
+
+    def skeleton(self, template, backend, **transpile_options):
+        """Routed theta-parameterized circuit for this structure and device (memory -> disk -> transpile)."""
+        key = self.key(template, backend, transpile_options)
+        if key in self._skeletons:
+            return self._skeletons[key]
+
+        path = os.path.join(self.cache_dir, key + ".qpy")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                qc = qpy.load(f)[0]
+            self.hits += 1
+        else:
+            qc = self._route(template, backend, transpile_options)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                qpy.dump(qc, f)
+            os.replace(tmp, path)
+            self.misses += 1
+
+        self._skeletons[key] = qc
+        return qc
+
+    def _route(self, template, backend, transpile_options):
+        circuit = self.shift(template).circuit
+        n, _, edges = structure(circuit)
+        layouts = [None]                    # the transpiler's own layout search
+        if "initial_layout" not in transpile_options:
+            greedy = initial_layout(n, edges, coupling_map_of(backend))
+            if greedy is not None:
+                layouts.insert(0, greedy)
+
+        best = None
+        for layout in layouts:
+            with tracing.span("route", qubits=n, device=device_name(backend),
+                              greedy=layout is not None) as sp:
+                opts = dict(transpile_options, initial_layout=layout) if layout else transpile_options
+                qc = transpile(circuit, backend=backend, seed_transpiler=self.seed, **opts)
+                cost = (two_qubit_count(qc), qc.depth())
+                sp.set(two_qubit=cost[0], depth=cost[1])
+            if best is None or cost < best[0]:
+                best = (cost, qc)
+        return best[1]
+
+    def bind_angles(self, template, theta, backend, **transpile_options):
+        """Routed circuit for per-gate angles theta (ParameterShift layout)."""
+        qc = self.skeleton(template, backend, **transpile_options)
+        if len(qc.parameters) != len(theta):
+            raise ValueError(f"Routed skeleton has {len(qc.parameters)} angles, "
+                             f"the template emits {len(theta)}")
+        # match by vector index: the skeleton may come from another problem / session
+        values = {prm: float(theta[prm.index]) for prm in qc.parameters}
+        with tracing.span("bind"):
+            return qc.assign_parameters(values, inplace=False)
+
+    def bind(self, template, params, backend, **transpile_options):
+        theta = self.shift(template).angles(params)
+        return self.bind_angles(template, theta, backend, **transpile_options)
+
+
+class RoutedTemplate:
+    """A QAOA template whose bind() goes through a LayoutManager (template interface)."""
+
+    def __init__(self, template, layouts):
+        self.template = template
+        self.layouts = layouts
+
+    def __getattr__(self, attr):
+        return getattr(self.template, attr)
+
+    def circuit_for(self, backend=None, **transpile_options):
+        if backend is None:
+            return self.template.circuit
+        return self.layouts.skeleton(self.template, backend, **transpile_options)
+
+    def bind(self, params, backend=None, **transpile_options):
+        if backend is None:
+            return self.template.bind(params)
+        return self.layouts.bind(self.template, params, backend, **transpile_options)
+
+    def bind_angles(self, theta, backend, **transpile_options):
+        """Per-gate angles on the cached skeleton; parameter-shift batches bind here."""
+        return self.layouts.bind_angles(self.template, theta, backend, **transpile_options)
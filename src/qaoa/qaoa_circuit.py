@@ -1,35 +1,243 @@
-from qiskit import QuantumCircuit
+import numpy as np
+from qiskit import QuantumCircuit, transpile
+from qiskit.circuit import ParameterVector
 
-def build_qaoa_circuit(bqm, var_names, params, p=1):
-    n = len(var_names)
-    qc = QuantumCircuit(n)
+from src.qubo.energy import QuboArrays
+from src.utils import tracing
+
+
+class QAOATemplate:
+    """
+    QAOA ansatz with symbolic gamma/beta, built once per problem.
+
+    The parameterized circuit is transpiled once per backend and cached; each
+    evaluation only binds new angles. params layout: [gamma_1..gamma_p, beta_1..beta_p].
+    """
+
+    def __init__(self, circuit, gammas, betas, bqm=None, var_names=None, ising=None,
+                 groups=None, mixer="x", tol=1e-9):
+        self.circuit = circuit
+        self.gammas = gammas
+        self.betas = betas
+        self.p = len(gammas)
+        self.bqm = bqm
+        self.var_names = var_names
+        if bqm is not None:
+            self.arrays = QuboArrays.from_bqm(bqm, var_names)
+        else:
+            # Ising-only template: packed QUBO of the same energies for counts-based estimates
+            self.arrays = QuboArrays.from_ising(ising[1], ising[2], ising[0]) if ising is not None else None
+        if ising is None and self.arrays is not None:
+            ising = self.arrays.to_ising()
+        self.ising = ising    # (const, h, J), used by the native statevector backend
+        self.groups = groups  # one-hot variable groups kept feasible by an XY mixer
+        self.mixer = mixer
+        self.tol = tol        # relative cutoff below which cost terms were dropped
+        self._transpiled = {}
+
+    def circuit_for(self, backend=None, **transpile_options):
+        """Parameterized circuit transpiled for `backend` (cached)."""
+        if backend is None:
+            return self.circuit
+        key = (id(backend), tuple(sorted((k, repr(v)) for k, v in transpile_options.items())))
+        if key not in self._transpiled:
+            with tracing.span("transpile", qubits=self.circuit.num_qubits, p=self.p):
+                qc_t = transpile(self.circuit, backend=backend, **transpile_options)
+            self._transpiled[key] = (backend, qc_t)
+        return self._transpiled[key][1]
+
+    def bind(self, params, backend=None, **transpile_options):
+        """Executable circuit for one parameter vector."""
+        values = {g: float(x) for g, x in zip(self.gammas, params[:self.p])}
+        values.update({b: float(x) for b, x in zip(self.betas, params[self.p:2*self.p])})
+        qc = self.circuit_for(backend, **transpile_options)
+        with tracing.span("bind"):
+            return qc.assign_parameters(values, inplace=False)
+
+
+def supports_rzz(backend):
+    """True if `backend` executes rzz natively (otherwise the transpiler decomposes it)."""
+    target = getattr(backend, "target", None)
+    if target is not None:
+        return "rzz" in target.operation_names
+    config = getattr(backend, "configuration", None)
+    return config is not None and "rzz" in config().basis_gates
+
+
+def edge_coloring(edges):
+    """
+    Greedy proper edge coloring: layers of pairwise disjoint edges, i.e.
+    ZZ terms that can run in parallel. Edges touching the busiest qubits are
+    placed first; uses at most 2 * max_degree - 1 layers. The result depends
+    only on the edge set, not its order, so equal structures compile alike.
+    """
+    degree = {}
+    for i, j in edges:
+        degree[i] = degree.get(i, 0) + 1
+        degree[j] = degree.get(j, 0) + 1
+    order = sorted(sorted(edges), key=lambda e: -(degree[e[0]] + degree[e[1]]))
 
-    var_to_idx = {v: i for i, v in enumerate(var_names)}
-    gammas = params[:p]
-    betas = params[p:2*p]
+    used = {}           # qubit -> set of colors
+    layers = []
+    for i, j in order:
+        taken = used.setdefault(i, set()) | used.setdefault(j, set())
+        color = next(c for c in range(len(layers) + 1) if c not in taken)
+        if color == len(layers):
+            layers.append([])
+        layers[color].append((i, j))
+        used[i].add(color)
+        used[j].add(color)
+    return layers
+
+
+def append_cost_layer(qc, h, J, gamma, native_rzz=True, tol=1e-9):
+    """
+    exp(-i gamma H) for H = sum h_i Z_i + sum J_ij Z_i Z_j.
+
+    Coefficients below tol * max|coefficient| are dropped. The ZZ terms
+    commute, so they are emitted one edge-colored layer at a time (depth =
+    number of colors), as rzz or, with native_rzz=False, as cx-rz-cx.
+    """
+    scale = max([abs(float(x)) for x in h] + [abs(float(x)) for x in J.values()] + [0.0])
+    cutoff = tol * scale
+
+    for i, hi in enumerate(h):
+        if abs(hi) > cutoff:
+            qc.rz(2 * gamma * float(hi), i)
+
+    edges = [e for e, Jij in J.items() if abs(Jij) > cutoff]
+    for layer in edge_coloring(edges):
+        for i, j in layer:
+            angle = 2 * gamma * float(J[(i, j)])
+            if native_rzz:
+                qc.rzz(angle, i, j)
+            else:
+                qc.cx(i, j)
+                qc.rz(angle, j)
+                qc.cx(i, j)
+
+
+def _qaoa_circuit(h, J, p, native_rzz, tol):
+    n = len(h)
+    qc = QuantumCircuit(n, n)
+    gammas = ParameterVector("gamma", p)
+    betas = ParameterVector("beta", p)
 
     qc.h(range(n))
+    for layer in range(p):
+        append_cost_layer(qc, h, J, gammas[layer], native_rzz, tol)
+        for i in range(n):
+            qc.rx(2 * betas[layer], i)
+
+    qc.measure(range(n), range(n))
+    return qc, gammas, betas
+
 
+def build_qaoa_template(bqm, var_names, p=1, native_rzz=True, tol=1e-9):
+    """
+    QAOA ansatz for a BINARY BQM, qubit i = var_names[i].
+
+    The cost layer is exp(-i gamma H) for the BQM's exact Ising form
+    (x_i = (1 - Z_i) / 2), the same unitary the statevector backend simulates.
+    """
+    ising = QuboArrays.from_bqm(bqm, var_names).to_ising()
+    qc, gammas, betas = _qaoa_circuit(ising[1], ising[2], p, native_rzz, tol)
+    return QAOATemplate(qc, gammas, betas, bqm, var_names, ising=ising, tol=tol)
+
+
+def build_ising_template(h, J, p=1, const=0.0, native_rzz=True, tol=1e-9):
+    """
+    QAOA ansatz for an Ising model (h, J) as produced by qubo_to_ising,
+    using rz / rzz cost gates. Classical bit i measures qubit i.
+    """
+    qc, gammas, betas = _qaoa_circuit(h, J, p, native_rzz, tol)
+    return QAOATemplate(qc, gammas, betas, ising=(const, h, J), tol=tol)
+
+
+def build_qaoa_circuit(bqm, var_names, params, p=1):
+    """One-off bound circuit; prefer build_qaoa_template inside optimizer loops."""
+    return build_qaoa_template(bqm, var_names, p).bind(params)
+
+
+# ---- XY mixers over one-hot groups ----
+
+MIXERS = ("ring", "complete")
+
+
+def xy_pairs(k, mixer="ring"):
+    """
+    Pairs (positions within a group of k) of one XY mixer layer, in the order
+    they are applied. The pair rotations do not commute, so this order
+    defines the mixer; the subspace simulator follows it exactly.
+    """
+    if mixer == "ring":
+        edges = sorted({tuple(sorted((i, (i + 1) % k))) for i in range(k) if k > 1})
+    elif mixer == "complete":
+        edges = [(i, j) for i in range(k) for j in range(i + 1, k)]
+    else:
+        raise ValueError(f"Unknown mixer '{mixer}'. Choose from: {' | '.join(MIXERS)}")
+    return [e for layer in edge_coloring(edges) for e in layer]
+
+
+def append_w_state(qc, qubits):
+    """Equal superposition of the one-hot states of `qubits` (real, positive amplitudes)."""
+    k = len(qubits)
+    qc.x(qubits[0])
+    for i in range(k - 1):
+        # keep 1/sqrt(k) on qubit i, pass the rest of its amplitude on to i + 1
+        qc.cry(2 * np.arccos(np.sqrt(1 / (k - i))), qubits[i], qubits[i + 1])
+        qc.cx(qubits[i + 1], qubits[i])
+
+
+def drop_group_couplings(arrays, groups):
+    """
+    The QUBO without couplings inside a group. x_i x_j = 0 for two members of
+    a one-hot group, so energies on the feasible subspace are unchanged.
+    """
+    label = np.full(arrays.n, -1)
+    for g, group in enumerate(groups):
+        label[group] = g
+    inside = (label[arrays.rows] >= 0) & (label[arrays.rows] == label[arrays.cols])
+    return QuboArrays(arrays.linear, arrays.rows[~inside], arrays.cols[~inside],
+                      arrays.quad[~inside], arrays.offset, arrays.var_names)
+
+
+def build_xy_template(bqm, var_names, groups, p=1, mixer="ring", native_rzz=True, tol=1e-9):
+    """
+    QAOA ansatz that never leaves the one-hot subspace of `groups` (lists of
+    variable indices, exactly one set in each, pairwise disjoint).
+
+    Each group starts in its W state and mixes with XY rotations
+    exp(-i beta (XX + YY) / 2) = rxx(beta) ryy(beta) over its ring or
+    complete graph; ungrouped qubits keep the H / RX(2 beta) X mixer. The
+    cost layer omits couplings inside a group (zero on the subspace).
+    """
+    arrays = QuboArrays.from_bqm(bqm, var_names)
+    groups = [list(map(int, group)) for group in groups]
+    grouped = [q for group in groups for q in group]
+    if len(set(grouped)) != len(grouped) or not all(group for group in groups):
+        raise ValueError("One-hot groups must be non-empty and pairwise disjoint")
+    free = [q for q in range(arrays.n) if q not in set(grouped)]
+    pairs = [[(group[a], group[b]) for a, b in xy_pairs(len(group), mixer)] for group in groups]
+
+    const, h, J = ising = drop_group_couplings(arrays, groups).to_ising()
+    qc = QuantumCircuit(arrays.n, arrays.n)
+    gammas = ParameterVector("gamma", p)
+    betas = ParameterVector("beta", p)
+
+    for group in groups:
+        append_w_state(qc, group)
+    if free:
+        qc.h(free)
     for layer in range(p):
-        gamma = gammas[layer]
-
-        # Quadratic penalty e^{-iγZ⊗Z}
-        for (u, v), coeff in bqm.quadratic.items():
-            q1 = var_to_idx[u]
-            q2 = var_to_idx[v]
-            qc.cx(q1, q2)
-            qc.rz(-2*gamma*coeff, q2)
-            qc.cx(q1, q2)
-
-        # Linear penalty e^{-iγZ}
-        for name, coeff in bqm.linear.items():
-            q = var_to_idx[name]
-            qc.rz(-gamma*coeff, q)
-
-        # Mixer e^{-iβX}
-        beta = betas[layer]
-        for q in range(n):
-            qc.rx(2*beta, q)
-
-    qc.measure_all()
-    return qc
+        append_cost_layer(qc, h, J, gammas[layer], native_rzz, tol)
+        for group_pairs in pairs:
+            for i, j in group_pairs:
+                qc.rxx(betas[layer], i, j)
+                qc.ryy(betas[layer], i, j)
+        for i in free:
+            qc.rx(2 * betas[layer], i)
+
+    qc.measure(range(arrays.n), range(arrays.n))
+    return QAOATemplate(qc, gammas, betas, bqm, var_names, ising=ising, groups=groups, mixer=mixer,
+                        tol=tol)
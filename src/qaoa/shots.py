@@ -0,0 +1,67 @@
+"""
+Adaptive shot allocation for QAOA objectives: shots grow as optimizer steps
+shrink, keeping the standard error below kappa times the expected change.
+"""
+
+import numpy as np
+
+
+class AdaptiveShots:
+    def __init__(self, backend, template, min_shots=64, max_shots=None, kappa=0.5,
+                 growth=2.0, callback=None):
+        self.backend = backend
+        self.template = template
+        self.min_shots = min_shots
+        self.fixed_shots = backend.shots
+        self.max_shots = max_shots or 4 * backend.shots
+        self.kappa = kappa
+        self.growth = growth
+        self.callback = callback
+
+        self.shots = min_shots
+        self.total_shots = 0
+        self.history = []           # (shots, energy) per evaluation
+        self._slope = None
+        self._last = None           # (params, energy)
+        self._variance = None
+
+    def __call__(self, params):
+        params = np.asarray(params, dtype=float)
+        if self._last is not None and self._variance is not None:
+            self.shots = self._next_shots(params)
+
+        default = self.backend.shots
+        self.backend.shots = self.shots
+        try:
+            counts, energy = self.backend.run_template(self.template, params)
+        finally:
+            self.backend.shots = default
+
+        self.total_shots += self.shots
+        self.history.append((self.shots, energy))
+        _, self._variance = self.template.arrays.moments(counts)
+
+        if self._last is not None:
+            step = np.linalg.norm(params - self._last[0])
+            if step > 0:
+                slope = abs(energy - self._last[1]) / step
+                self._slope = slope if self._slope is None else 0.7 * self._slope + 0.3 * slope
+        self._last = (params, energy)
+
+        if self.callback is not None:
+            self.callback(params, energy, self.shots)
+        return energy
+
+    def _next_shots(self, params):
+        step = np.linalg.norm(params - self._last[0])
+        if not self._slope or step == 0:
+            return self.shots
+        target = self.kappa * self._slope * step
+        need = self._variance / max(target, 1e-12) ** 2
+        need = min(need, self.shots * self.growth, self.max_shots)
+        return int(max(self.shots, self.min_shots, np.ceil(need)))
+
+    def summary(self):
+        return (f"{len(self.history)} evaluations, {self.total_shots} shots "
+                f"(final {self.shots}/eval; {len(self.history) * self.fixed_shots} "
+                f"at a fixed {self.fixed_shots}/eval)")
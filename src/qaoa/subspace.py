@@ -0,0 +1,121 @@
+"""
+QAOA simulation of XY-mixer templates on their feasible one-hot subspace:
+one tensor axis per group, exact energies and adjoint gradients.
+"""
+
+import numpy as np
+
+from src.qaoa.qaoa_circuit import xy_pairs
+from src.qubo.counts import Counts
+
+
+def group_mixer(k, pairs, beta):
+    """(U, dU/dbeta) of one XY mixer layer on a group's one-hot states."""
+    c, s = np.cos(beta), np.sin(beta)
+    U = np.eye(k, dtype=complex)
+    dU = np.zeros((k, k), dtype=complex)
+    for a, b in pairs:
+        R = np.eye(k, dtype=complex)
+        R[a, a] = R[b, b] = c
+        R[a, b] = R[b, a] = -1j * s
+        dR = np.zeros((k, k), dtype=complex)
+        dR[a, a] = dR[b, b] = -s
+        dR[a, b] = dR[b, a] = -1j * c
+        dU = R @ dU + dR @ U
+        U = R @ U
+    return U, dU
+
+
+def _apply(psi, M, axis):
+    return np.moveaxis(np.tensordot(M, psi, axes=(1, axis)), 0, axis)
+
+
+class SubspaceQAOA:
+    def __init__(self, arrays, groups, mixer="ring"):
+        self.n = arrays.n
+        self.groups = [list(group) for group in groups]
+        grouped = {q for group in self.groups for q in group}
+        self.free = [q for q in range(self.n) if q not in grouped]
+        self.shape = tuple(len(group) for group in self.groups) + (2,) * len(self.free)
+        self.dim = int(np.prod(self.shape))
+
+        # axis -> mixer pairs; a free qubit is a 2-state "group" whose rotation is RX(2 beta)
+        self.pairs = [xy_pairs(len(group), mixer) for group in self.groups] + [[(0, 1)]] * len(self.free)
+
+        # enumerate the subspace in C order of self.shape
+        idx = np.indices(self.shape).reshape(len(self.shape), -1)
+        X = np.zeros((self.dim, self.n), dtype=np.uint8)
+        rows = np.arange(self.dim)
+        for axis, group in enumerate(self.groups):
+            X[rows, np.asarray(group)[idx[axis]]] = 1
+        for axis, q in enumerate(self.free, start=len(self.groups)):
+            X[:, q] = idx[axis]
+        self.states = X
+        self.diag = arrays.energies(X)
+
+    @classmethod
+    def from_template(cls, template):
+        return cls(template.arrays, template.groups, template.mixer)
+
+    def _mixers(self, beta):
+        return [group_mixer(k, pairs, beta) for k, pairs in zip(self.shape, self.pairs)]
+
+    def _mix(self, psi, mixers, adjoint=False):
+        for axis, (U, _) in enumerate(mixers):
+            psi = _apply(psi, U.conj().T if adjoint else U, axis)
+        return psi
+
+    def state(self, params):
+        """Amplitudes over self.states (row k of states is basis state k)."""
+        params = np.asarray(params, dtype=float)
+        p = len(params) // 2
+        psi = np.full(self.shape, self.dim ** -0.5, dtype=complex)
+        diag = self.diag.reshape(self.shape)
+        for layer in range(p):
+            psi = psi * np.exp(-1j * params[layer] * diag)
+            psi = self._mix(psi, self._mixers(params[p + layer]))
+        return psi.ravel()
+
+    def probabilities(self, params):
+        psi = self.state(params)
+        return psi.real ** 2 + psi.imag ** 2
+
+    def expectation(self, params):
+        """Exact <H> of the QAOA state."""
+        return float(self.probabilities(params) @ self.diag)
+
+    def expectation_and_gradient(self, params):
+        """Exact <H> and its adjoint gradient w.r.t. [gammas, betas]."""
+        params = np.asarray(params, dtype=float)
+        p = len(params) // 2
+        diag = self.diag.reshape(self.shape)
+        psi = self.state(params).reshape(self.shape)
+        lam = diag * psi
+        energy = float(np.vdot(psi, lam).real)
+
+        grad = np.zeros(2 * p)
+        for layer in reversed(range(p)):
+            # d(U_1 x ... x U_m) = sum over axes of (dU_a U_a^dagger) on axis a, times the layer
+            mixers = self._mixers(params[p + layer])
+            grad[p + layer] = 2 * sum(
+                np.vdot(lam, _apply(psi, dU @ U.conj().T, axis)).real
+                for axis, (U, dU) in enumerate(mixers)
+            )
+            psi = self._mix(psi, mixers, adjoint=True)
+            lam = self._mix(lam, mixers, adjoint=True)
+
+            grad[layer] = 2 * np.vdot(lam, diag * psi).imag
+            phase = np.exp(1j * params[layer] * diag)
+            psi = psi * phase
+            lam = lam * phase
+
+        return energy, grad
+
+    def sample(self, params, shots, seed=None):
+        """Counts over the full n variables, sampled from the exact distribution."""
+        probs = self.probabilities(params)
+        rng = np.random.default_rng(seed)
+        hits = np.bincount(rng.choice(self.dim, size=shots, p=probs / probs.sum()),
+                           minlength=self.dim)
+        nonzero = np.flatnonzero(hits)
+        return Counts.from_bits(self.states[nonzero], hits[nonzero])
@@ -0,0 +1,181 @@
+"""
+Resumable parameter sweeps (penalty, shots, depth, seed, backend, mixer) on a
+process pool; each finished cell is appended to a columnar SweepStore.
+"""
+
+import glob
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+import numpy as np
+from scipy.optimize import minimize
+
+KEY_FIELDS = ("P", "p", "shots", "seed", "backend", "mixer")
+
+
+def cell_key(cell):
+    return "|".join(f"{k}={cell[k]}" for k in KEY_FIELDS)
+
+
+def sweep_grid(penalties, shots, ps, seeds, backends, mixers=("x",)):
+    """All cells of the grid as dicts, penalty-major. mixer: "x", or "ring" / "complete" XY."""
+    return [
+        {"P": float(P), "p": int(p), "shots": int(s), "seed": int(seed), "backend": str(b),
+         "mixer": str(m)}
+        for P, p, s, seed, b, m in product(penalties, ps, shots, seeds, backends, mixers)
+    ]
+
+
+class SweepStore:
+    """
+    Append-only columnar store: a directory of .npz parts, one array per
+    column. Each part is written atomically, so a crash never leaves a
+    half-written cell. compact() merges the parts into one.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.path, "part-*.npz")))
+
+    def append(self, rows):
+        if not rows:
+            return
+        columns = {name: np.array([row[name] for row in rows]) for name in rows[0]}
+        name = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.npz"
+        tmp = os.path.join(self.path, "." + name)
+        with open(tmp, "wb") as f:
+            np.savez(f, **columns)
+        os.replace(tmp, os.path.join(self.path, name))
+
+    def load(self, columns=None):
+        """{column: array} over every stored cell."""
+        parts = []
+        for part in self._parts():
+            with np.load(part) as data:
+                parts.append({k: data[k] for k in (columns or data.files)})
+        if not parts:
+            return {}
+        return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+    def done_keys(self):
+        return set(self.load(["key"]).get("key", np.array([], dtype=str)).tolist())
+
+    def compact(self):
+        parts = self._parts()
+        if len(parts) < 2:
+            return
+        data = self.load()
+        rows = [dict(zip(data, values)) for values in zip(*data.values())]
+        self.append(rows)
+        for part in parts:
+            os.remove(part)
+
+    def __len__(self):
+        return len(self.done_keys())
+
+
+# ---- worker side ----
+
+_models = {}
+_templates = {}
+
+
+def _init_worker(models):
+    _models.update(models)
+
+
+def _template(P, p, mixer):
+    from src.qaoa.qaoa_circuit import build_qaoa_template, build_xy_template
+
+    if (P, p, mixer) not in _templates:
+        model = _models[P]["model"]
+        if mixer == "x":
+            template = build_qaoa_template(model.bqm(), model.var_names, p)
+        else:
+            template = build_xy_template(model.bqm(), model.var_names, model.one_hot_groups(),
+                                         p, mixer)
+        _templates[(P, p, mixer)] = template
+    return _templates[(P, p, mixer)]
+
+
+def _run_cell(cell, maxiter, init):
+    from src.backends import get_backend
+
+    t0 = time.perf_counter()
+    model = _models[cell["P"]]["model"]
+    ref_cost = _models[cell["P"]]["reference"]
+    template = _template(cell["P"], cell["p"], cell["mixer"])
+
+    backend = get_backend(cell["backend"])
+    backend.shots = cell["shots"]
+    if hasattr(backend, "seed"):
+        backend.seed = cell["seed"]
+    elif hasattr(backend, "run_options"):
+        backend.run_options["seed_simulator"] = cell["seed"]     # Aer shot noise
+
+    rng = np.random.default_rng(cell["seed"])
+    x0 = np.full(2 * cell["p"], init) + rng.normal(scale=0.05, size=2 * cell["p"])
+    evals = []
+
+    def objective(params):
+        e = backend.run_template(template, params)[1]
+        evals.append(e)
+        return e
+
+    res = minimize(objective, x0, method="COBYLA", options={"maxiter": maxiter})
+    counts, energy = backend.run_template(template, res.x)
+
+    X, w = counts.bits(), counts.probabilities()
+    ok = model.feasible(X)
+    cost = model.cost(X)
+    optimal = ok & np.isclose(cost, ref_cost) if ref_cost is not None else np.zeros(len(X), bool)
+
+    return {
+        "key": cell_key(cell),
+        **cell,
+        "energy": float(energy),
+        "p_feasible": float(w[ok].sum()),
+        "p_optimal": float(w[optimal].sum()),
+        "best_feasible_cost": float(cost[ok].min()) if ok.any() else np.nan,
+        "reference_cost": float(ref_cost) if ref_cost is not None else np.nan,
+        "evaluations": len(evals) + 1,
+        "seconds": time.perf_counter() - t0,
+        "params": " ".join(f"{x:.6g}" for x in res.x),
+    }
+
+
+# ---- driver ----
+
+def run_sweep(models, cells, store, processes=None, maxiter=30, init=0.4, callback=None):
+    """
+    Run every cell not yet in `store` over a process pool.
+
+    models: {P: CompiledNetwork}; the reference optimum is solved once per P.
+    callback(row) is called in the parent as each cell is stored.
+    Returns the number of cells run.
+    """
+    done = store.done_keys()
+    todo = [c for c in cells if cell_key(c) not in done]
+    if not todo:
+        return 0
+
+    payload = {}
+    for P in {c["P"] for c in todo}:
+        ref = models[P].reference()
+        payload[P] = {"model": models[P], "reference": None if ref is None else ref[0]}
+
+    processes = min(processes or os.cpu_count() or 1, len(todo))
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(payload,)) as pool:
+        futures = [pool.submit(_run_cell, cell, maxiter, init) for cell in todo]
+        for future in as_completed(futures):
+            row = future.result()
+            store.append([row])
+            if callback is not None:
+                callback(row)
+    return len(todo)
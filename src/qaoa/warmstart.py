@@ -0,0 +1,139 @@
+"""
+Warm starts for QAOA angles, stored per structural fingerprint of the Ising
+form; nearest-problem lookup and INTERP to deeper p.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+
+FEATURE_DECIMALS = 2
+
+
+def coefficient_scale(arrays):
+    """Largest |h_i| or |J_ij| of the Ising form."""
+    _, h, J = arrays.to_ising()
+    values = np.abs(np.concatenate((h, np.fromiter(J.values(), dtype=float, count=len(J)))))
+    return float(values.max()) if len(values) and values.max() > 0 else 1.0
+
+
+def problem_features(arrays):
+    """Feature vector: n, edge density, degree and normalized |h| / |J| statistics."""
+    _, h, J = arrays.to_ising()
+    scale = coefficient_scale(arrays)
+    n = len(h)
+    Jv = np.abs(np.fromiter(J.values(), dtype=float, count=len(J))) / scale
+    hv = np.abs(h) / scale
+    degree = np.zeros(n)
+    for i, j in J:
+        degree[i] += 1
+        degree[j] += 1
+    density = len(J) / max(n * (n - 1) / 2, 1)
+
+    def stats(v):
+        return [float(v.mean()), float(v.std())] if len(v) else [0.0, 0.0]
+
+    return np.array([n, density, *stats(degree / max(n - 1, 1)), *stats(hv), *stats(Jv)])
+
+
+def fingerprint(features):
+    rounded = np.round(features, FEATURE_DECIMALS) + 0.0
+    return hashlib.sha256(json.dumps(rounded.tolist()).encode()).hexdigest()[:16]
+
+
+def interpolate(params):
+    """
+    INTERP: depth-p angles [gammas, betas] -> depth p+1 initial point.
+    x_i(p+1) = (i-1)/p x_{i-1}(p) + (p-i+1)/p x_i(p), with x_0 = x_{p+1} = 0.
+    """
+    params = np.asarray(params, dtype=float)
+    p = len(params) // 2
+
+    def up(x):
+        padded = np.concatenate(([0.0], x, [0.0]))
+        i = np.arange(1, p + 2)
+        return (i - 1) / p * padded[i - 1] + (p - i + 1) / p * padded[i]
+
+    return np.concatenate((up(params[:p]), up(params[p:])))
+
+
+class ParameterStore:
+    """JSON file of optimized angles: one best record per (fingerprint, p)."""
+
+    def __init__(self, path, max_distance=0.25):
+        self.path = path
+        self.max_distance = max_distance
+        self._lock = threading.Lock()
+        self.records = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for rec in json.load(f):
+                    self.records[(rec["fingerprint"], rec["p"])] = rec
+
+    def put(self, arrays, p, params, energy):
+        """Record optimized angles; keeps the lower-energy record per problem and depth."""
+        features = problem_features(arrays)
+        scale = coefficient_scale(arrays)
+        params = np.asarray(params, dtype=float)
+        normalized = np.concatenate((params[:p] * scale, params[p:2 * p]))
+        key = (fingerprint(features), p)
+        with self._lock:
+            old = self.records.get(key)
+            if old is not None and old["energy"] <= energy:
+                return
+            self.records[key] = {
+                "fingerprint": key[0],
+                "p": p,
+                "features": features.tolist(),
+                "params": normalized.tolist(),
+                "energy": float(energy),
+            }
+            self._save()
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(list(self.records.values()), f, indent=1)
+        os.replace(tmp, self.path)
+
+    def _nearest(self, features, p):
+        key = (fingerprint(features), p)
+        if key in self.records:
+            return self.records[key]
+        best, best_d = None, self.max_distance
+        for (_, depth), rec in self.records.items():
+            if depth != p:
+                continue
+            ref = np.asarray(rec["features"])
+            # relative distance, so n and the normalized statistics weigh alike
+            d = float(np.max(np.abs(ref - features) / np.maximum(np.abs(ref), 1.0)))
+            if d <= best_d:
+                best, best_d = rec, d
+        return best
+
+    def get(self, arrays, p):
+        """Stored angles for this (or the most similar) problem at depth p, else None."""
+        features = problem_features(arrays)
+        with self._lock:
+            rec = self._nearest(features, p)
+            if rec is not None:
+                x = np.asarray(rec["params"])
+            else:
+                for depth in range(p - 1, 0, -1):
+                    rec = self._nearest(features, depth)
+                    if rec is not None:
+                        break
+                if rec is None:
+                    return None
+                x = np.asarray(rec["params"])
+                for _ in range(depth, p):
+                    x = interpolate(x)
+        scale = coefficient_scale(arrays)
+        return np.concatenate((x[:p] / scale, x[p:]))
+
+    def initial_point(self, arrays, p, default):
+        x = self.get(arrays, p)
+        return np.asarray(default, dtype=float) if x is None else x
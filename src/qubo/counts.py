@@ -0,0 +1,167 @@
+"""
+Array-backed measurement results: states packed into uint64 words, one weight
+per state. Qiskit bit order: variable i is bit i, the rightmost character of
+a bitstring key and column i of bits().
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+WORD = 64
+
+
+def _words(n):
+    return max(1, -(-n // WORD))
+
+
+def pack_bits(X):
+    """(S, n) 0/1 matrix -> (S, words) uint64, column i -> bit i."""
+    X = np.asarray(X, dtype=np.uint8)
+    S, n = X.shape
+    padded = np.zeros((S, _words(n) * WORD), dtype=np.uint8)
+    padded[:, :n] = X
+    return np.packbits(padded, axis=1, bitorder="little").view("<u8").astype(np.uint64, copy=False)
+
+
+def unpack_bits(states, n):
+    """(S, words) uint64 -> (S, n) uint8 bit matrix, bit i -> column i."""
+    states = np.ascontiguousarray(states, dtype="<u8")
+    return np.unpackbits(states.view(np.uint8), axis=1, bitorder="little")[:, :n]
+
+
+class Counts(Mapping):
+    def __init__(self, states, weights, n):
+        states = np.asarray(states, dtype=np.uint64)
+        if states.ndim == 1:
+            states = states[:, None]
+        self.states = states
+        self.weights = np.asarray(weights)
+        self.n = n
+        self._index = None
+        self._bits = None
+
+    # ---- construction ----
+
+    @classmethod
+    def from_bits(cls, X, weights=None):
+        """Counts from an (S, n) bit matrix (column i = variable i); repeated rows are summed."""
+        X = np.atleast_2d(np.asarray(X, dtype=np.uint8))
+        if weights is None:
+            weights = np.ones(len(X), dtype=np.int64)
+        return cls(pack_bits(X), weights, X.shape[1]).aggregate()
+
+    @classmethod
+    def from_dict(cls, counts, n):
+        """
+        Counts from a Qiskit counts dict (bitstring keys, register spaces
+        ignored) or quasi-distribution (integer keys).
+        """
+        if isinstance(counts, Counts):
+            return counts
+        keys = list(counts.keys())
+        values = list(counts.values())
+        integral = all(isinstance(v, (int, np.integer)) for v in values)
+        weights = np.array(values, dtype=np.int64 if integral else float)
+        if not keys:
+            return cls(np.zeros((0, _words(n)), dtype=np.uint64), weights, n)
+
+        if isinstance(keys[0], str):
+            joined = "".join(keys).replace(" ", "").encode()
+            X = np.frombuffer(joined, dtype=np.uint8).reshape(len(keys), n) - ord("0")
+            return cls.from_bits(X[:, ::-1], weights)
+
+        mask = (1 << WORD) - 1
+        states = np.array([[(int(k) >> (WORD * w)) & mask for w in range(_words(n))] for k in keys],
+                          dtype=np.uint64)
+        return cls(states, weights, n).aggregate()
+
+    @classmethod
+    def from_indices(cls, indices, hits, n):
+        """Counts from basis-state indices (n <= 64) and their hit counts."""
+        return cls(np.asarray(indices, dtype=np.uint64), hits, n)
+
+    # ---- arrays ----
+
+    def bits(self):
+        """(S, n) uint8 bit matrix, column i = variable i (unpacked once, read-only)."""
+        if self._bits is None:
+            self._bits = np.ascontiguousarray(unpack_bits(self.states, self.n))
+            self._bits.setflags(write=False)
+        return self._bits
+
+    @property
+    def total(self):
+        return self.weights.sum()
+
+    def probabilities(self):
+        return self.weights / self.weights.sum()
+
+    def aggregate(self):
+        """Merge repeated states (summing weights)."""
+        if len(self.states) == 0:
+            return self
+        states, inverse = np.unique(self.states, axis=0, return_inverse=True)
+        weights = np.bincount(inverse.ravel(), weights=self.weights, minlength=len(states))
+        if self.weights.dtype.kind in "iu":
+            weights = np.rint(weights).astype(np.int64)
+        return Counts(states, weights, self.n)
+
+    def merge(self, *others):
+        """Sum of several histograms over the same variables."""
+        parts = (self,) + others
+        if any(c.n != self.n for c in parts):
+            raise ValueError("Counts over different numbers of bits cannot be merged")
+        return Counts(np.concatenate([c.states for c in parts]),
+                      np.concatenate([c.weights for c in parts]), self.n).aggregate()
+
+    def __add__(self, other):
+        return self.merge(other)
+
+    def top(self, k):
+        """The k heaviest states, heaviest first."""
+        order = np.argsort(-self.weights, kind="stable")[:k]
+        return Counts(self.states[order], self.weights[order], self.n)
+
+    # ---- Mapping over Qiskit-style bitstring keys ----
+
+    def _key(self, row):
+        bits = unpack_bits(row[None, :], self.n)[0]
+        return (bits[::-1] + ord("0")).tobytes().decode()
+
+    def _keys(self):
+        if len(self.states) == 0:
+            return []
+        X = self.bits()[:, ::-1] + ord("0")
+        text = np.ascontiguousarray(X).tobytes().decode()
+        return [text[k * self.n:(k + 1) * self.n] for k in range(len(X))]
+
+    def _lookup(self):
+        if self._index is None:
+            self._index = {key: k for k, key in enumerate(self._keys())}
+        return self._index
+
+    def __getitem__(self, key):
+        if not isinstance(key, str):
+            key = format(int(key), f"0{self.n}b")
+        k = self._lookup()[key.replace(" ", "")]
+        return self.weights[k].item()
+
+    def __iter__(self):
+        return iter(self._lookup())
+
+    def __len__(self):
+        return len(self.states)
+
+    def __repr__(self):
+        shown = dict(zip(self.top(8)._keys(), self.top(8).weights.tolist()))
+        more = ", ..." if len(self) > 8 else ""
+        return f"Counts(n={self.n}, {shown}{more})"
+
+    def to_dict(self):
+        return dict(zip(self._keys(), self.weights.tolist()))
+
+
+def as_counts(counts, n):
+    """Counts for anything a backend may return (Counts, counts dict, quasi-distribution)."""
+    return counts if isinstance(counts, Counts) else Counts.from_dict(counts, n)
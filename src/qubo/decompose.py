@@ -0,0 +1,160 @@
+"""
+qbsolv-style decomposition: improve an assignment by solving sub-QUBOs of at
+most `size` variables (the rest clamped) with any solver arrays -> (X, E).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.qubo.energy import QuboArrays, counts_to_arrays
+from src.qubo.tabu import tabu_search
+
+
+def clamp(arrays, x, keep):
+    """
+    Sub-QUBO over the variables `keep` (sorted) with all others fixed to x.
+    sub.energies(y) == arrays.energies(x with x[keep] = y).
+    """
+    keep = np.sort(np.asarray(keep, dtype=np.intp))
+    x = np.asarray(x, dtype=float)
+    mask = np.zeros(arrays.n, dtype=bool)
+    mask[keep] = True
+    pos = np.full(arrays.n, -1, dtype=np.intp)
+    pos[keep] = np.arange(len(keep))
+
+    r, c, w = arrays.rows, arrays.cols, arrays.quad
+    in_r, in_c = mask[r], mask[c]
+
+    linear = arrays.linear[keep].copy()
+    half = in_r & ~in_c
+    np.add.at(linear, pos[r[half]], w[half] * x[c[half]])
+    half = ~in_r & in_c
+    np.add.at(linear, pos[c[half]], w[half] * x[r[half]])
+
+    fixed = ~in_r & ~in_c
+    offset = (arrays.offset + arrays.linear[~mask] @ x[~mask]
+              + np.sum(w[fixed] * x[r[fixed]] * x[c[fixed]]))
+
+    both = in_r & in_c
+    names = [arrays.var_names[i] for i in keep] if arrays.var_names is not None else None
+    return QuboArrays(linear, pos[r[both]], pos[c[both]], w[both], offset, names)
+
+
+def flip_gains(arrays, x):
+    """Energy change of flipping each variable of x."""
+    x = np.asarray(x, dtype=float)
+    return (1 - 2 * x) * (arrays.linear + arrays.adjacency() @ x)
+
+
+def neighbourhood_groups(arrays, order, size):
+    """
+    Partition the variables into groups of at most `size`: each group starts
+    at the best-ranked unassigned variable in `order` and grows breadth-first
+    through the coupling graph, so constraint-coupled variables move together.
+    """
+    W = arrays.adjacency()
+    rank = np.empty(arrays.n, dtype=np.intp)
+    rank[order] = np.arange(arrays.n)
+    taken = np.zeros(arrays.n, dtype=bool)
+    groups = []
+    for seed in order:
+        if taken[seed]:
+            continue
+        group, frontier = [seed], [seed]
+        taken[seed] = True
+        while frontier and len(group) < size:
+            nbrs = np.unique(np.concatenate([W.indices[W.indptr[i]:W.indptr[i + 1]] for i in frontier]))
+            nbrs = nbrs[~taken[nbrs]]
+            nbrs = nbrs[np.argsort(rank[nbrs], kind="stable")][:size - len(group)]
+            taken[nbrs] = True
+            group += nbrs.tolist()
+            frontier = nbrs.tolist()
+        groups.append(np.array(group, dtype=np.intp))
+    return groups
+
+
+def backend_solver(backend, p=1, params=None, maxiter=20):
+    """
+    Solver running QAOA on a backend for each sub-QUBO.
+
+    params: fixed [gammas, betas]; None optimizes them with COBYLA for
+    `maxiter` evaluations per subproblem.
+    """
+    from scipy.optimize import minimize
+
+    from src.qaoa.qaoa_circuit import build_qaoa_template
+    from src.qubo.problem_network import arrays_to_bqm
+
+    def solve(sub):
+        names = sub.var_names or [f"x{i}" for i in range(sub.n)]
+        template = build_qaoa_template(arrays_to_bqm(sub, names), names, p)
+        if params is None:
+            x0 = np.full(2 * p, 0.5)
+            best = minimize(lambda t: backend.run_template(template, t)[1], x0,
+                            method="COBYLA", options={"maxiter": maxiter}).x
+        else:
+            best = params
+        counts, _ = backend.run_template(template, best)
+        X, _ = counts_to_arrays(counts, sub.n)
+        return X, sub.energies(X)
+
+    return solve
+
+
+def decompose(arrays, solver, size, x0=None, max_passes=50, patience=5,
+              workers=1, seed=None):
+    """
+    Improve an assignment by solving clamped sub-QUBOs of at most `size`
+    variables until `patience` passes in a row bring no improvement.
+
+    x0: starting assignment; default one short tabu run on the full problem.
+    workers > 1 solves the subproblems of a pass concurrently against the
+    same x (threads: backends are mostly waiting on I/O); their results are
+    then merged one by one, each kept only if it still lowers the energy.
+
+    Returns (x, energy).
+    """
+    n = arrays.n
+    if x0 is None:
+        X, E = tabu_search(arrays, num_restarts=1, seed=seed)
+        x0 = X[np.argmin(E)]
+    x = np.asarray(x0, dtype=np.uint8).copy()
+    energy = float(arrays.energies(x))
+    if n <= size:
+        X, E = solver(arrays)
+        k = int(np.argmin(E))
+        return (X[k].astype(np.uint8), float(E[k])) if E[k] < energy else (x, energy)
+
+    rng = np.random.default_rng(seed)
+    stale = 0
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        for _ in range(max_passes):
+            if stale == 0:
+                order = np.argsort(flip_gains(arrays, x), kind="stable")
+            else:
+                order = rng.permutation(n)          # diversify after a pass without progress
+            groups = neighbourhood_groups(arrays, order, size)
+            start = energy
+
+            if workers > 1:
+                subs = [clamp(arrays, x, g) for g in groups]
+                results = list(pool.map(solver, subs))
+
+            for k, group in enumerate(groups):
+                sub = clamp(arrays, x, group)
+                if workers > 1:
+                    X = results[k][0]    # re-scored: other groups may have moved x
+                else:
+                    X = solver(sub)[0]
+                E = sub.energies(X)
+                j = int(np.argmin(E))
+                if E[j] < energy - 1e-12:
+                    x[np.sort(group)] = X[j]
+                    energy = float(E[j])
+
+            stale = stale + 1 if energy >= start - 1e-12 else 0
+            if stale >= patience:
+                break
+
+    return x, energy
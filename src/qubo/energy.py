@@ -0,0 +1,155 @@
+"""
+Vectorized QUBO energy engine: a BQM is packed once into NumPy arrays, then a
+whole counts histogram is scored in one pass.
+"""
+
+import numpy as np
+
+from src.qubo.counts import as_counts
+
+
+class QuboArrays:
+    """
+    Packed QUBO:  E(x) = offset + linear . x + sum_k quad[k] * x[rows[k]] * x[cols[k]]
+
+    linear: (n,) float array, diagonal / linear coefficients
+    rows, cols: (m,) int arrays, quadratic couplings with rows < cols
+    quad: (m,) float array, coupling weights
+    """
+
+    def __init__(self, linear, rows, cols, quad, offset=0.0, var_names=None):
+        self.linear = np.asarray(linear, dtype=float)
+        self.rows = np.asarray(rows, dtype=np.intp)
+        self.cols = np.asarray(cols, dtype=np.intp)
+        self.quad = np.asarray(quad, dtype=float)
+        self.offset = float(offset)
+        self.var_names = list(var_names) if var_names is not None else None
+        self.n = len(self.linear)
+        self._dense = None
+        self._adjacency = None
+
+    @classmethod
+    def from_bqm(cls, bqm, var_names):
+        """Pack a dimod BINARY BQM, variable i -> var_names[i]."""
+        index = {v: i for i, v in enumerate(var_names)}
+        linear = np.zeros(len(var_names))
+        for v, c in bqm.linear.items():
+            linear[index[v]] += c
+
+        rows, cols, quad = [], [], []
+        for (u, v), c in bqm.quadratic.items():
+            i, j = index[u], index[v]
+            rows.append(min(i, j))
+            cols.append(max(i, j))
+            quad.append(c)
+
+        return cls(linear, rows, cols, quad, bqm.offset, var_names)
+
+    @classmethod
+    def from_qubo(cls, Q, n, var_names=None):
+        """Pack a `Qubo` dict {(i, j): w} with i <= j (diagonal = linear)."""
+        linear = np.zeros(n)
+        pairs = {}
+        for (i, j), w in Q.items():
+            if i == j:
+                linear[i] += w
+            else:
+                key = (min(i, j), max(i, j))
+                pairs[key] = pairs.get(key, 0.0) + w
+
+        rows = [i for i, _ in pairs]
+        cols = [j for _, j in pairs]
+        return cls(linear, rows, cols, list(pairs.values()), 0.0, var_names)
+
+    @classmethod
+    def from_ising(cls, h, J, const=0.0, var_names=None):
+        """Inverse of to_ising: the QUBO with s_i = 1 - 2 x_i."""
+        h = np.asarray(h, dtype=float)
+        linear = -2 * h
+        offset = float(const) + h.sum()
+        rows, cols, quad = [], [], []
+        for (i, j), w in J.items():
+            linear[i] -= 2 * w
+            linear[j] -= 2 * w
+            offset += w
+            rows.append(min(i, j))
+            cols.append(max(i, j))
+            quad.append(4 * w)
+        return cls(linear, rows, cols, quad, offset, var_names)
+
+    def dense(self):
+        """Upper-triangular (n, n) matrix with the linear terms on the diagonal."""
+        if self._dense is None:
+            M = np.diag(self.linear)
+            np.add.at(M, (self.rows, self.cols), self.quad)
+            self._dense = M
+        return self._dense
+
+    def adjacency(self):
+        """
+        Symmetric coupling matrix W (scipy CSR, zero diagonal), so the flip
+        gain of x_i is (1 - 2 x_i) * (linear[i] + W[i] . x).
+        """
+        if self._adjacency is None:
+            from scipy import sparse
+            W = sparse.coo_matrix((self.quad, (self.rows, self.cols)), shape=(self.n, self.n))
+            self._adjacency = (W + W.T).tocsr()
+            self._adjacency.sum_duplicates()
+        return self._adjacency
+
+    def to_ising(self):
+        """
+        Ising form (const, h, J) with x_i = (1 - s_i) / 2, same convention as
+        network_qaoa_sim.qubo_to_ising. J is a dict {(i, j): J_ij}, i < j.
+        """
+        const = self.offset + self.linear.sum() / 2 + self.quad.sum() / 4
+        h = -self.linear / 2
+        np.subtract.at(h, self.rows, self.quad / 4)
+        np.subtract.at(h, self.cols, self.quad / 4)
+        J = {}
+        for i, j, w in zip(self.rows.tolist(), self.cols.tolist(), self.quad.tolist()):
+            J[(i, j)] = J.get((i, j), 0.0) + w / 4
+        return float(const), h, J
+
+    def energies(self, X):
+        """Energies of a (S, n) 0/1 matrix (or a single length-n vector)."""
+        X = np.asarray(X, dtype=float)
+        single = X.ndim == 1
+        X = np.atleast_2d(X)
+        E = self.offset + np.einsum("si,ij,sj->s", X, self.dense(), X, optimize=True)
+        return E[0] if single else E
+
+    def expected(self, counts):
+        """Count-weighted mean energy of a counts histogram."""
+        X, weights = counts_to_arrays(counts, self.n)
+        return float(weights @ self.energies(X) / weights.sum())
+
+    def moments(self, counts):
+        """(mean, variance) of the per-shot energy over a counts histogram."""
+        X, weights = counts_to_arrays(counts, self.n)
+        p = weights / weights.sum()
+        E = self.energies(X)
+        mean = float(p @ E)
+        return mean, float(p @ (E - mean) ** 2)
+
+
+def pair_terms(group, weight):
+    """COO (rows, cols, weights) for weight * x_a x_b over all pairs in `group`, rows < cols."""
+    group = np.asarray(group, dtype=np.intp)
+    a, b = np.triu_indices(len(group), 1)
+    return np.minimum(group[a], group[b]), np.maximum(group[a], group[b]), np.full(len(a), weight)
+
+
+def concat_parts(parts, dtype):
+    """One array from a list of COO chunks (empty when there are none)."""
+    return np.concatenate(parts).astype(dtype) if parts else np.zeros(0, dtype=dtype)
+
+
+def counts_to_arrays(counts, n):
+    """
+    Counts (or a Qiskit counts dict / quasi-distribution) -> (bits matrix
+    (S, n) uint8, weights (S,) float). Column i is variable / qubit i, see
+    src.qubo.counts for the bit-order convention.
+    """
+    counts = as_counts(counts, n)
+    return counts.bits(), counts.weights.astype(float)
@@ -0,0 +1,181 @@
+"""
+Exact reference solver: exhaustive QUBO enumeration in chunked Gray-code
+order (one incremental update per step), optionally on a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+LOW_BITS = 18
+FEASIBLE_BATCH = 4096
+
+_worker = {}
+
+
+class ExhaustiveResult:
+    """
+    top: list of (energy, bits) sorted by energy, at most top_k entries
+    best_feasible: (energy, bits) or None (no feasibility check / none found)
+    bits are tuples of 0/1 in variable order.
+    """
+
+    def __init__(self, top, best_feasible, n_states):
+        self.top = top
+        self.best_feasible = best_feasible
+        self.n_states = n_states
+
+    @property
+    def best(self):
+        return self.top[0]
+
+
+def state_to_bits(state, n):
+    """Packed state (bit i = variable i) -> tuple of 0/1."""
+    return tuple((int(state) >> i) & 1 for i in range(n))
+
+
+def states_to_matrix(states, n):
+    """Packed states (S,) -> (S, n) uint8 bit matrix, column i = variable i."""
+    states = np.asarray(states, dtype=np.int64)
+    return ((states[:, None] >> np.arange(n)) & 1).astype(np.uint8)
+
+
+def all_states(n):
+    """(2^n, n) bit matrix of every assignment, in itertools.product order."""
+    return states_to_matrix(np.arange(2 ** n), n)[:, ::-1]
+
+
+def _field(coeffs):
+    """Vector over 2^len(coeffs) states of sum_l coeffs[l] * bit_l(state)."""
+    F = np.zeros(1)
+    for c in coeffs:
+        F = np.concatenate((F, F + c))
+    return F
+
+
+def _init_worker(arrays, low_bits, feasible, top_k):
+    n = arrays.n
+    L = min(n, low_bits)
+    W = arrays.dense()
+    W = W + W.T - 2 * np.diag(np.diag(W))   # symmetric couplings, zero diagonal
+    lin = arrays.linear
+
+    E_low = np.zeros(1)
+    for k in range(L):
+        E_low = np.concatenate((E_low, E_low + lin[k] + _field(W[:k, k])))
+
+    _worker.update(
+        n=n,
+        L=L,
+        W_pp=W[L:, L:],
+        lin_p=lin[L:],
+        offset=arrays.offset,
+        E_low=E_low,
+        F=[_field(W[:L, p]) for p in range(L, n)],
+        feasible=feasible,
+        top_k=top_k,
+    )
+
+
+def _merge_top(top_E, top_S, E, states, k):
+    E = np.concatenate((top_E, E))
+    S = np.concatenate((top_S, states))
+    if len(E) > k:
+        keep = np.argpartition(E, k - 1)[:k]
+        E, S = E[keep], S[keep]
+    return E, S
+
+
+def _run_chunk(t0, t1):
+    w = _worker
+    L, H, k = w["L"], w["n"] - w["L"], w["top_k"]
+    W_pp, lin_p, F = w["W_pp"], w["lin_p"], w["F"]
+    feasible = w["feasible"]
+    low_idx = np.arange(2 ** L, dtype=np.int64)
+
+    g = t0 ^ (t0 >> 1)
+    xp = np.array([(g >> p) & 1 for p in range(H)], dtype=float)
+    pf = W_pp @ xp
+    E = w["offset"] + w["E_low"] + lin_p @ xp + 0.5 * xp @ pf
+    for p in range(H):
+        if xp[p]:
+            E = E + F[p]
+
+    top_E, top_S = np.zeros(0), np.zeros(0, dtype=np.int64)
+    feas_E, feas_S = np.inf, -1
+
+    for t in range(t0, t1):
+        if t > t0:
+            p = ((t & -t).bit_length()) - 1
+            sign = 1.0 - 2.0 * xp[p]
+            E += sign * (lin_p[p] + pf[p])
+            E += sign * F[p]
+            xp[p] += sign
+            pf += sign * W_pp[:, p]
+            g ^= 1 << p
+
+        prefix = g << L
+        thr = top_E.max() if len(top_E) >= k else np.inf
+        idx = np.flatnonzero(E < thr)
+        if idx.size:
+            if idx.size > k:
+                idx = idx[np.argpartition(E[idx], k - 1)[:k]]
+            top_E, top_S = _merge_top(top_E, top_S, E[idx], prefix | low_idx[idx], k)
+
+        if feasible is not None:
+            idx = np.flatnonzero(E < feas_E)
+            if idx.size:
+                idx = idx[np.argsort(E[idx], kind="stable")]
+                for b in range(0, idx.size, FEASIBLE_BATCH):
+                    batch = idx[b:b + FEASIBLE_BATCH]
+                    ok = np.flatnonzero(feasible(states_to_matrix(prefix | batch, w["n"])))
+                    if ok.size:
+                        feas_E, feas_S = float(E[batch[ok[0]]]), int(prefix | batch[ok[0]])
+                        break
+
+    return top_E, top_S, feas_E, feas_S
+
+
+def solve_exhaustive(arrays, top_k=1, feasible=None, processes=None,
+                     low_bits=LOW_BITS, chunks_per_process=4):
+    """
+    Enumerate all 2^n assignments of a QuboArrays model.
+
+    feasible: optional vectorized predicate, (S, n) uint8 bit matrix -> (S,) bool.
+              Must be picklable (module-level) when processes > 1.
+    processes: worker processes; None = os.cpu_count(), 1 = run in-process.
+    """
+    n = arrays.n
+    H = n - min(n, low_bits)
+    steps = 2 ** H
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, steps))
+    n_chunks = min(steps, processes * chunks_per_process)
+    bounds = [steps * c // n_chunks for c in range(n_chunks + 1)]
+    ranges = list(zip(bounds[:-1], bounds[1:]))
+
+    if processes == 1:
+        _init_worker(arrays, low_bits, feasible, top_k)
+        parts = [_run_chunk(t0, t1) for t0, t1 in ranges]
+    else:
+        with ProcessPoolExecutor(
+            processes,
+            initializer=_init_worker,
+            initargs=(arrays, low_bits, feasible, top_k),
+        ) as pool:
+            parts = list(pool.map(_run_chunk, *zip(*ranges)))
+
+    top_E, top_S = np.zeros(0), np.zeros(0, dtype=np.int64)
+    best_feasible = None
+    for E, S, fE, fS in parts:
+        top_E, top_S = _merge_top(top_E, top_S, E, S, top_k)
+        if fS >= 0 and (best_feasible is None or fE < best_feasible[0]):
+            best_feasible = (fE, state_to_bits(fS, n))
+
+    order = np.argsort(top_E, kind="stable")
+    top = [(float(top_E[i]), state_to_bits(top_S[i], n)) for i in order]
+    return ExhaustiveResult(top, best_feasible, 2 ** n)
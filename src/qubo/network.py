@@ -0,0 +1,324 @@
+"""
+General graph network model: nodes with roles (source, sink, battery, relay)
+and explicit arcs. compile(P) gives the QUBO, a vectorized feasibility
+checker and the classical reference, all in one variable order.
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, milp
+
+from src.qubo.energy import QuboArrays, concat_parts, pair_terms
+from src.qubo.exhaustive import solve_exhaustive
+
+ROLES = ("source", "sink", "battery", "relay")
+
+
+class Node:
+    def __init__(self, name, role, capacity=None, demand=0, cost=0.0, usage_cost=0.0):
+        if role not in ROLES:
+            raise ValueError(f"Unknown role '{role}'. Choose from: {' | '.join(ROLES)}")
+        self.name = name
+        self.role = role
+        self.capacity = capacity
+        self.demand = demand
+        self.cost = cost
+        self.usage_cost = usage_cost
+
+
+class Network:
+    def __init__(self):
+        self.nodes = {}
+        self.arcs = []          # (tail, head, cost)
+
+    def add_node(self, name, role, **attrs):
+        self.nodes[name] = Node(name, role, **attrs)
+        return self.nodes[name]
+
+    def add_arc(self, tail, head, cost=None):
+        """cost=None: the tail's source cost (0 for non-sources)."""
+        if tail not in self.nodes or head not in self.nodes:
+            raise KeyError(f"Arc {tail}->{head} references an unknown node")
+        self.arcs.append((tail, head, cost))
+
+    @classmethod
+    def from_roles(cls, sources, sinks, batteries=(), relays=(), arcs=None,
+                   costs=None, capacities=None, usage_costs=None):
+        """
+        sources: list of names; sinks: {name: demand}; batteries / relays: names.
+        arcs: explicit (tail, head) list, default source->sink, source->storage,
+        storage->sink as in build_network_qubo.
+        """
+        costs = costs or {}
+        capacities = capacities or {}
+        usage_costs = usage_costs or {}
+        net = cls()
+        for s in sources:
+            net.add_node(s, "source", capacity=capacities.get(s), cost=costs.get(s, 0.0))
+        for k, d in sinks.items():
+            net.add_node(k, "sink", demand=d)
+        for b in batteries:
+            net.add_node(b, "battery", usage_cost=usage_costs.get(b, 0.0))
+        for r in relays:
+            net.add_node(r, "relay")
+
+        if arcs is None:
+            storage = list(batteries) + list(relays)
+            arcs = [(s, j) for s in sources for j in list(sinks) + storage]
+            arcs += [(b, j) for b in storage for j in sinks]
+        for tail, head in arcs:
+            net.add_arc(tail, head)
+        return net
+
+    def compile(self, penalty):
+        return CompiledNetwork(self, penalty)
+
+
+class CompiledNetwork:
+    def __init__(self, network, penalty):
+        self.network = network
+        self.penalty = P = float(penalty)
+        nodes = network.nodes
+        node_index = {name: k for k, name in enumerate(nodes)}
+
+        self.arc_names = [f"f_{t}_{h}" for t, h, _ in network.arcs]
+        n_arcs = len(self.arc_names)
+
+        incoming = {name: [] for name in nodes}
+        outgoing = {name: [] for name in nodes}
+        arc_cost = np.zeros(n_arcs)
+        tails = np.empty(n_arcs, dtype=np.intp)
+        heads = np.empty(n_arcs, dtype=np.intp)
+        for a, (t, h, cost) in enumerate(network.arcs):
+            outgoing[t].append(a)
+            incoming[h].append(a)
+            tails[a], heads[a] = node_index[t], node_index[h]
+            if cost is None:
+                cost = nodes[t].cost if nodes[t].role == "source" else 0.0
+            arc_cost[a] = cost + (nodes[h].usage_cost if nodes[h].role == "battery" else 0.0)
+        self.arc_cost = arc_cost
+
+        # Sparse node x arc incidence, for vectorized flow balances
+        cols = np.arange(n_arcs)
+        shape = (len(nodes), n_arcs)
+        self._in = sparse.csr_matrix((np.ones(n_arcs), (heads, cols)), shape=shape)
+        self._out = sparse.csr_matrix((np.ones(n_arcs), (tails, cols)), shape=shape)
+
+        terms = _Terms(n_arcs)
+        terms.add_linear(np.arange(n_arcs), arc_cost)
+        self.slack_names = []
+        self._slack_groups = []     # (node index, weights) in slack variable order
+
+        for name, node in nodes.items():
+            if node.role == "sink":
+                terms.square([(a, 1.0) for a in incoming[name]], -node.demand, P)
+            elif node.role in ("battery", "relay"):
+                terms.square([(a, 1.0) for a in incoming[name]]
+                             + [(a, -1.0) for a in outgoing[name]], 0.0, P)
+            elif node.role == "source":
+                out, cap = outgoing[name], node.capacity
+                if cap is None or cap >= len(out):
+                    continue
+                if cap == 1:
+                    terms.pairs(out, P)
+                elif cap == 0:
+                    terms.add_linear(out, P)
+                else:
+                    weights = _slack_weights(cap)
+                    slack = [terms.add_var() for _ in weights]
+                    self.slack_names += [f"s_{name}_{k}" for k in range(len(weights))]
+                    self._slack_groups.append((node_index[name], weights))
+                    terms.square([(a, 1.0) for a in out]
+                                 + list(zip(slack, weights)), -cap, P)
+
+        self.var_names = self.arc_names + self.slack_names
+        self.arrays = terms.arrays(self.var_names)
+        self._one_hot = [list(incoming[name]) for name, node in nodes.items()
+                         if node.role == "sink" and node.demand == 1 and incoming[name]]
+
+        self._sink_demand = np.array([node.demand if node.role == "sink" else 0 for node in nodes.values()])
+        self._is_sink = np.array([node.role == "sink" for node in nodes.values()])
+        self._is_storage = np.array([node.role in ("battery", "relay") for node in nodes.values()])
+        self._cap = np.array([
+            node.capacity if node.role == "source" and node.capacity is not None else np.inf
+            for node in nodes.values()
+        ])
+
+    @property
+    def n_arcs(self):
+        return len(self.arc_names)
+
+    def flows(self, X):
+        """(inflow, outflow) per node for a (S, n) bit matrix (arc columns first)."""
+        X = np.atleast_2d(np.asarray(X))[:, :self.n_arcs].astype(float)
+        return np.asarray(self._in @ X.T).T, np.asarray(self._out @ X.T).T
+
+    def feasible(self, X):
+        """Vectorized feasibility over a (S, n) bit matrix -> (S,) bool."""
+        inflow, outflow = self.flows(X)
+        ok = (inflow[:, self._is_sink] == self._sink_demand[self._is_sink]).all(axis=1)
+        ok &= (outflow <= self._cap).all(axis=1)
+        ok &= (inflow[:, self._is_storage] == outflow[:, self._is_storage]).all(axis=1)
+        return ok
+
+    def cost(self, X):
+        """True objective (arc costs incl. battery usage), no penalties."""
+        X = np.atleast_2d(np.asarray(X))[:, :self.n_arcs].astype(float)
+        return X @ self.arc_cost
+
+    def check(self, bits):
+        """Per-node constraint report for one assignment: {node: (value, target, ok)}."""
+        inflow, outflow = self.flows(np.asarray(bits)[None, :])
+        report = {}
+        for k, (name, node) in enumerate(self.network.nodes.items()):
+            if node.role == "sink":
+                report[name] = (inflow[0, k], node.demand, inflow[0, k] == node.demand)
+            elif node.role == "source" and node.capacity is not None:
+                report[name] = (outflow[0, k], node.capacity, outflow[0, k] <= node.capacity)
+            elif node.role in ("battery", "relay"):
+                report[name] = (inflow[0, k], outflow[0, k], inflow[0, k] == outflow[0, k])
+        return report
+
+    def to_qubo(self):
+        """Index-keyed Qubo dict {(i, j): w} (the constant offset is dropped)."""
+        Q = {}
+        for i, w in enumerate(self.arrays.linear):
+            if w != 0:
+                Q[(i, i)] = float(w)
+        for i, j, w in zip(self.arrays.rows.tolist(), self.arrays.cols.tolist(), self.arrays.quad.tolist()):
+            Q[(i, j)] = Q.get((i, j), 0.0) + w
+        return Q
+
+    def bqm(self):
+        from src.qubo.problem_network import arrays_to_bqm
+        return arrays_to_bqm(self.arrays, self.var_names)
+
+    def reference(self, top_k=1, processes=None, method="milp"):
+        """
+        Classical reference for the feasible optimum.
+        Returns (cost, bits) or None; bits cover var_names (arcs + slack).
+
+        method="milp": exact constrained optimum via scipy's MILP solver,
+        fine for hundreds of arcs. method="exhaustive": enumerate the QUBO
+        (small models only; top_k / processes apply here).
+        """
+        if method == "milp":
+            return self.milp_reference()
+        if method != "exhaustive":
+            raise ValueError(f"Unknown method '{method}'. Choose from: milp | exhaustive")
+        res = solve_exhaustive(self.arrays, top_k=top_k, feasible=self.feasible, processes=processes)
+        if res.best_feasible is None:
+            return None
+        bits = res.best_feasible[1]
+        return float(self.cost(np.array(bits))[0]), bits
+
+    def milp_reference(self, time_limit=None):
+        """
+        The network as a binary program over the arcs:
+            min arc_cost . x
+            s.t. inflow == demand (sinks), inflow == outflow (storage),
+                 outflow <= capacity (sources)
+        Returns (cost, bits) with slack bits filled in, or None if infeasible.
+        """
+        rows, lb, ub = [], [], []
+        if self._is_sink.any():
+            rows.append(self._in[self._is_sink])
+            d = self._sink_demand[self._is_sink].astype(float)
+            lb.append(d)
+            ub.append(d)
+        if self._is_storage.any():
+            rows.append((self._in - self._out)[self._is_storage])
+            z = np.zeros(int(self._is_storage.sum()))
+            lb.append(z)
+            ub.append(z)
+        capped = np.isfinite(self._cap)
+        if capped.any():
+            rows.append(self._out[capped])
+            lb.append(np.full(int(capped.sum()), -np.inf))
+            ub.append(self._cap[capped])
+
+        constraints = []
+        if rows:
+            constraints.append(LinearConstraint(sparse.vstack(rows).tocsr(),
+                                                np.concatenate(lb), np.concatenate(ub)))
+        options = {} if time_limit is None else {"time_limit": time_limit}
+        res = milp(self.arc_cost, constraints=constraints, integrality=np.ones(self.n_arcs),
+                   bounds=Bounds(0, 1), options=options)
+        if res.x is None:
+            return None
+
+        arcs = np.round(res.x).astype(np.uint8)
+        bits = np.concatenate((arcs, self.slack_bits(arcs)))
+        return float(self.cost(arcs)[0]), tuple(int(b) for b in bits)
+
+    def one_hot_groups(self):
+        """Arc indices of each demand-1 sink's inflow: exactly one is set when feasible."""
+        return [list(group) for group in self._one_hot]
+
+    def slack_bits(self, arcs):
+        """Slack bits matching an arc assignment: each group encodes cap - outflow."""
+        _, outflow = self.flows(np.asarray(arcs)[None, :])
+        bits = []
+        for k, weights in self._slack_groups:
+            rest = max(int(self._cap[k] - outflow[0, k]), 0)
+            group = [0] * len(weights)
+            for i in np.argsort(weights)[::-1]:
+                if weights[i] <= rest:
+                    group[i] = 1
+                    rest -= weights[i]
+            bits += group
+        return np.array(bits, dtype=np.uint8)
+
+
+def _slack_weights(cap):
+    """Binary slack weights 1, 2, 4, ... summing to exactly cap."""
+    weights, total = [], 0
+    while total < cap:
+        w = min(2 ** len(weights), cap - total)
+        weights.append(w)
+        total += w
+    return weights
+
+
+class _Terms:
+    """COO accumulator for squared linear penalties; slack variables extend it."""
+
+    def __init__(self, n):
+        self.n = n
+        self.offset = 0.0
+        self.lin_idx, self.lin_val = [], []
+        self.rows, self.cols, self.quad = [], [], []
+
+    def add_var(self):
+        self.n += 1
+        return self.n - 1
+
+    def add_linear(self, idx, values):
+        idx = np.asarray(idx, dtype=np.intp)
+        self.lin_idx.append(idx)
+        self.lin_val.append(np.broadcast_to(np.asarray(values, dtype=float), idx.shape))
+
+    def pairs(self, group, weight):
+        r, c, w = pair_terms(group, weight)
+        self.rows.append(r)
+        self.cols.append(c)
+        self.quad.append(w)
+
+    def square(self, terms, const, weight):
+        """weight * (sum_k c_k x_k + const)^2 for binary x (x^2 = x)."""
+        self.offset += weight * const ** 2
+        if not terms:
+            return
+        idx = np.array([i for i, _ in terms], dtype=np.intp)
+        c = np.array([w for _, w in terms], dtype=float)
+        self.add_linear(idx, weight * (c ** 2 + 2 * const * c))
+        a, b = np.triu_indices(len(idx), 1)
+        self.rows.append(np.minimum(idx[a], idx[b]))
+        self.cols.append(np.maximum(idx[a], idx[b]))
+        self.quad.append(2 * weight * c[a] * c[b])
+
+    def arrays(self, var_names):
+        linear = np.bincount(concat_parts(self.lin_idx, np.intp),
+                             concat_parts(self.lin_val, float), minlength=self.n)
+        return QuboArrays(linear, concat_parts(self.rows, np.intp), concat_parts(self.cols, np.intp),
+                          concat_parts(self.quad, float), self.offset, var_names)
@@ -0,0 +1,275 @@
+"""
+QUBO presolve: fix and merge variables (dominance, roof-duality persistency,
+probing) so the circuit needs fewer qubits. Presolved.expand maps reduced
+samples back, with reduced and original energies equal.
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+
+from src.qubo.counts import Counts, as_counts
+from src.qubo.decompose import clamp
+from src.qubo.energy import QuboArrays
+from src.qubo.tabu import tabu_search
+
+
+def substitute(arrays, a, b, k, m):
+    """
+    QUBO over m variables y with x_i = a[i] + b[i] * y[k[i]] substituted;
+    variables with b[i] == 0 are fixed to a[i] (k[i] is then ignored).
+    """
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    k = np.where(b != 0, k, 0)
+    lin, r, c, q = arrays.linear, arrays.rows, arrays.cols, arrays.quad
+
+    offset = arrays.offset + lin @ a + np.sum(q * a[r] * a[c])
+    linear = np.zeros(m)
+    live = b != 0
+    np.add.at(linear, k[live], (lin * b)[live])
+    live = b[c] != 0
+    np.add.at(linear, k[c][live], (q * a[r] * b[c])[live])
+    live = b[r] != 0
+    np.add.at(linear, k[r][live], (q * a[c] * b[r])[live])
+
+    w = q * b[r] * b[c]
+    live = w != 0
+    kr, kc, w = k[r][live], k[c][live], w[live]
+    same = kr == kc
+    np.add.at(linear, kr[same], w[same])            # y^2 == y
+
+    lo, hi, w = np.minimum(kr, kc)[~same], np.maximum(kr, kc)[~same], w[~same]
+    pairs, inverse = np.unique(lo * max(m, 1) + hi, return_inverse=True)
+    quad = np.bincount(inverse.ravel(), weights=w, minlength=len(pairs))
+    keep = quad != 0
+    return QuboArrays(linear, (pairs // max(m, 1))[keep], (pairs % max(m, 1))[keep],
+                      quad[keep], offset)
+
+
+def roof_dual(arrays):
+    """
+    (lower bound, LP solution x) of the roof-duality relaxation:
+        min a.x + sum q_k y_k,  y_k >= x_i + x_j - 1 (q_k > 0),
+        y_k <= x_i, y_k <= x_j (q_k < 0),  0 <= x, y <= 1
+    """
+    n, m = arrays.n, len(arrays.quad)
+    if n == 0:
+        return arrays.offset, np.zeros(0)
+    r, c, q = arrays.rows, arrays.cols, arrays.quad
+    pos = np.flatnonzero(q > 0)
+    neg = np.flatnonzero(q < 0)
+
+    # rows: x_r + x_c - y <= 1 for q > 0; y - x_r <= 0 and y - x_c <= 0 for q < 0
+    n_rows = len(pos) + 2 * len(neg)
+    row = np.concatenate([np.repeat(np.arange(len(pos)), 3),
+                          len(pos) + np.repeat(np.arange(2 * len(neg)), 2)])
+    col = np.concatenate([np.column_stack([r[pos], c[pos], n + pos]).ravel(),
+                          np.column_stack([n + neg, r[neg], n + neg, c[neg]]).ravel()])
+    val = np.concatenate([np.tile([1.0, 1.0, -1.0], len(pos)),
+                          np.tile([1.0, -1.0], 2 * len(neg))])
+    A = sparse.csr_matrix((val, (row, col)), shape=(n_rows, n + m))
+    b = np.concatenate([np.ones(len(pos)), np.zeros(2 * len(neg))])
+
+    res = linprog(np.concatenate([arrays.linear, q]), A_ub=A if n_rows else None,
+                  b_ub=b if n_rows else None, bounds=(0, 1), method="highs")
+    if res.status != 0:
+        raise RuntimeError(f"Roof-dual LP failed: {res.message}")
+    return arrays.offset + res.fun, res.x[:n]
+
+
+def dominance_fixings(arrays):
+    """{i: value} for variables whose best value does not depend on the others."""
+    W = arrays.adjacency()
+    neg = np.asarray(W.minimum(0).sum(axis=1)).ravel()
+    pos = np.asarray(W.maximum(0).sum(axis=1)).ravel()
+    fixed = {int(i): 0 for i in np.flatnonzero(arrays.linear + neg >= 0)}
+    fixed.update({int(i): 1 for i in np.flatnonzero(arrays.linear + pos <= 0)})
+    return fixed
+
+
+def roof_dual_fixings(arrays, tol=1e-6):
+    _, x = roof_dual(arrays)
+    return {int(i): int(round(x[i])) for i in np.flatnonzero(np.abs(x - np.round(x)) <= tol)}
+
+
+def _excluded(arrays, assign, upper, tol):
+    """True when the roof-dual bound with `assign` ({i: v}) fixed exceeds `upper`."""
+    x = np.zeros(arrays.n)
+    for i, v in assign.items():
+        x[i] = v
+    keep = np.setdiff1d(np.arange(arrays.n), list(assign))
+    return roof_dual(clamp(arrays, x, keep))[0] > upper + tol * max(1.0, abs(upper))
+
+
+def probe(arrays, upper, pairs=True, tol=1e-6):
+    """
+    Fixings {i: v} and merges [(i, j, complemented)] implied by an upper
+    bound on the optimum (both hold for every optimum).
+    """
+    fixed = {}
+    for i in range(arrays.n):
+        for v in (0, 1):
+            if _excluded(arrays, {i: v}, upper, tol):
+                fixed[i] = 1 - v
+                break
+    if fixed or not pairs:
+        return fixed, []
+
+    merges = []
+    for i, j in zip(arrays.rows.tolist(), arrays.cols.tolist()):
+        if i == j:
+            continue
+        if _excluded(arrays, {i: 0, j: 1}, upper, tol) and _excluded(arrays, {i: 1, j: 0}, upper, tol):
+            merges.append((i, j, False))
+        elif _excluded(arrays, {i: 0, j: 0}, upper, tol) and _excluded(arrays, {i: 1, j: 1}, upper, tol):
+            merges.append((i, j, True))
+    return fixed, merges
+
+
+class Presolved:
+    """
+    A reduced QUBO and its map back to the original variables:
+    x_i = offsets[i] + signs[i] * y[index[i]] (signs[i] == 0: x_i fixed).
+    """
+
+    def __init__(self, original, offsets, signs, index, reduced, lower_bound=None):
+        self.original = original
+        self.offsets = np.asarray(offsets, dtype=np.int8)
+        self.signs = np.asarray(signs, dtype=np.int8)
+        self.index = np.asarray(index, dtype=np.intp)
+        self.arrays = reduced
+        self.n = reduced.n
+        self.lower_bound = lower_bound
+        names = self._names()
+        self.var_names = [names[i] for i in self._representatives()]
+        reduced.var_names = self.var_names
+
+    @property
+    def fixed(self):
+        """{original variable: value} of the fixed variables."""
+        names = self._names()
+        return {names[i]: int(self.offsets[i]) for i in np.flatnonzero(self.signs == 0)}
+
+    @property
+    def merged(self):
+        """{original variable: (reduced variable, complemented)} of the merged variables."""
+        names = self._names()
+        reps = self._representatives()
+        return {
+            names[i]: (self.var_names[self.index[i]], bool(self.signs[i] < 0))
+            for i in np.flatnonzero(self.signs != 0) if reps[self.index[i]] != i
+        }
+
+    def _names(self):
+        return self.original.var_names or list(range(self.original.n))
+
+    def _representatives(self):
+        """Original variable behind each reduced variable."""
+        reps = np.empty(self.n, dtype=np.intp)
+        live = np.flatnonzero(self.signs == 1)[::-1]
+        reps[self.index[live]] = live                # lowest index wins
+        return reps
+
+    def expand(self, Y):
+        """Reduced samples (S, m) -> original assignments (S, n) uint8."""
+        Y = np.atleast_2d(np.asarray(Y, dtype=np.int8))
+        X = self.offsets + self.signs * Y[:, self.index] if self.n else \
+            np.broadcast_to(self.offsets, (len(Y), len(self.offsets)))
+        return np.asarray(X, dtype=np.uint8)
+
+    def restrict(self, X):
+        """Original assignments (S, n) -> reduced samples (S, m), e.g. for warm starts."""
+        X = np.atleast_2d(np.asarray(X, dtype=np.uint8))
+        return X[:, self._representatives()]
+
+    def expand_counts(self, counts):
+        """Counts over the reduced variables -> Counts over the original ones."""
+        counts = as_counts(counts, self.n)
+        X = self.expand(counts.bits()) if len(counts) else np.zeros((0, self.original.n), np.uint8)
+        return Counts.from_bits(X, counts.weights)
+
+    def bqm(self):
+        from src.qubo.problem_network import arrays_to_bqm
+        return arrays_to_bqm(self.arrays, self.var_names)
+
+    def summary(self):
+        return {
+            "variables": self.original.n,
+            "reduced": self.n,
+            "fixed": int(np.sum(self.signs == 0)),
+            "merged": self.original.n - self.n - int(np.sum(self.signs == 0)),
+            "lower_bound": self.lower_bound,
+        }
+
+
+def presolve(arrays, probing=True, pairs=True, upper_bound=None, x0=None, seed=0, tol=1e-6):
+    """
+    Reduce a QuboArrays model. Returns a Presolved.
+
+    probing uses an upper bound on the optimum: `upper_bound`, the energy of
+    `x0`, or else the best of a short tabu search. pairs=False skips the
+    pairwise merges (4 LPs per coupling).
+    """
+    n = arrays.n
+    offsets = np.zeros(n, dtype=np.int8)
+    signs = np.ones(n, dtype=np.int8)
+    index = np.arange(n)
+    reduced = QuboArrays(arrays.linear, arrays.rows, arrays.cols, arrays.quad, arrays.offset)
+
+    if probing and upper_bound is None:
+        if x0 is not None:
+            upper_bound = float(arrays.energies(x0))
+        elif n:
+            upper_bound = float(tabu_search(arrays, num_restarts=8, seed=seed)[1].min())
+
+    def apply(fixed, merges):
+        """Substitute {reduced i: value} and [(i, j, complemented)] into the current map."""
+        nonlocal offsets, signs, index, reduced
+        m = reduced.n
+        a, b, k = np.zeros(m, dtype=np.int8), np.ones(m, dtype=np.int8), np.arange(m)
+        for i, v in fixed.items():
+            a[i], b[i] = v, 0
+        for i, j, complemented in merges:
+            ri, rj = k[i], k[j]
+            si, sj = int(b[i]), int(b[j])
+            if si == 0 or sj == 0:
+                continue
+            # x_j := x_i (or 1 - x_i), on top of earlier merges in this round
+            if ri == rj:
+                continue
+            target_a = (a[i] if not complemented else 1 - a[i])
+            target_b = si if not complemented else -si
+            moved = (k == rj) & (b != 0)
+            # x = a + b y_rj, with y_rj = (x_j - a_j) / b_j and x_j = target_a + target_b y_ri
+            scale = b[moved] * sj                   # b / b_j, b_j = +-1
+            a[moved] = a[moved] + scale * (target_a - a[j])
+            b[moved] = scale * target_b
+            k[moved] = ri
+        live = np.unique(k[b != 0])
+        renumber = np.full(m, -1, dtype=np.intp)
+        renumber[live] = np.arange(len(live))
+        reduced = substitute(reduced, a, b, renumber[k], len(live))
+
+        # compose with the map from the original variables
+        inner = signs != 0
+        new_offsets, new_signs, new_index = offsets.copy(), np.zeros(n, dtype=np.int8), np.zeros(n, dtype=np.intp)
+        j = index[inner]
+        s = signs[inner]
+        new_offsets[inner] = offsets[inner] + s * a[j]
+        new_signs[inner] = s * b[j]
+        new_index[inner] = np.where(b[j] != 0, renumber[k[j]], 0)
+        offsets, signs, index = new_offsets, new_signs, new_index
+
+    while reduced.n:
+        fixed = dominance_fixings(reduced)
+        if not fixed:
+            fixed = roof_dual_fixings(reduced, tol)
+        merges = []
+        if not fixed and probing:
+            fixed, merges = probe(reduced, upper_bound, pairs, tol)
+        if not fixed and not merges:
+            break
+        apply(fixed, merges)
+
+    return Presolved(arrays, offsets, signs, index, reduced, float(roof_dual(reduced)[0]))
@@ -1,69 +1,102 @@
-import itertools
+import numpy as np
 import dimod
 
+from src.qubo.energy import QuboArrays, concat_parts, pair_terms
+
 """
 General scalable network QUBO builder.
 Initial version = 2 sources, 2 sinks, 1 battery.
 Later, increase number of sources/sinks/batteries dynamically.
+
+Arcs are integer indices with per-node incidence lists; coefficients are
+emitted as NumPy COO arrays, so building is linear in the number of QUBO
+terms and never parses variable names.
 """
 
-def build_network_qubo(sources, sinks, battery, costs, capacities, penalty=8.0):
+
+def network_arcs(sources, sinks, battery):
     """
-    sources: list of source node names, e.g. ["A", "B"]
-    sinks: dict of sink nodes and their demand, e.g. {"C":1, "D":1}
-    battery: str, name of battery node, e.g. "E"
-    costs: dict cost[source]
-    capacities: dict Gmax[source]
+    Valid arcs for the minimal network solver, in the order of
+    `for i in nodes for j in nodes` with nodes = sources + sinks + [battery]:
+    source -> sink, source -> battery, battery -> sink.
+    """
+    sink_names = list(sinks.keys())
+    arcs = [(s, j) for s in sources for j in sink_names + [battery]]
+    arcs += [(battery, j) for j in sink_names]
+    return arcs
 
-    Returns: bqm, var_names
+
+def build_network_arrays(sources, sinks, battery, costs, capacities, penalty=8.0):
     """
+    Same model as build_network_qubo, as packed arrays.
 
-    nodes = sources + list(sinks.keys()) + [battery]
+    Returns: QuboArrays, var_names
+    """
+    arcs = network_arcs(sources, sinks, battery)
+    var_names = [f"f_{i}_{j}" for (i, j) in arcs]
+    n = len(arcs)
 
-    # Valid arcs for minimal network solver
-    valid_arcs = [
-        (i, j)
-        for i in nodes
-        for j in nodes
-        if i != j and (
-            (i in sources and j in sinks.keys()) or    # source -> sink
-            (i in sources and j == battery) or         # source -> battery
-            (i == battery and j in sinks.keys())       # battery -> sink
-        )
-    ]
+    incoming = {}
+    outgoing = {}
+    for k, (i, j) in enumerate(arcs):
+        outgoing.setdefault(i, []).append(k)
+        incoming.setdefault(j, []).append(k)
 
-    var_names = [f"f_{i}_{j}" for (i, j) in valid_arcs]
-    linear, quadratic = {}, {}
+    linear = np.zeros(n)
+    rows, cols, quad = [], [], []
 
     # --- Cost terms ---
-    for v in var_names:
-        src = v.split('_')[1]
-        if src in sources:
-            linear[v] = linear.get(v, 0) + costs[src]
+    for src in sources:
+        linear[outgoing.get(src, [])] += costs[src]
 
     # --- Demand constraints (each sink must receive exactly demand units) ---
+    # (sum incoming - demand)^2
     for sink, demand in sinks.items():
-        incoming = [v for v in var_names if v.endswith("_" + sink)]
-
-        # (sum incoming - demand)^2
-        for v in incoming:
-            linear[v] = linear.get(v, 0) + penalty - 2 * penalty * demand
-
-        for v1, v2 in itertools.combinations(incoming, 2):
-            quadratic[(v1, v2)] = quadratic.get((v1, v2), 0) + 2 * penalty
+        group = incoming.get(sink, [])
+        linear[group] += penalty - 2 * penalty * demand
+        r, c, w = pair_terms(group, 2 * penalty)
+        rows.append(r)
+        cols.append(c)
+        quad.append(w)
 
     # --- Capacity constraints for sources ---
+    # Penalize > cap
     for src in sources:
-        outgoing = [v for v in var_names if v.startswith(f"f_{src}_")]
+        group = outgoing.get(src, [])
         cap = capacities[src]
+        linear[group] += penalty - 2 * penalty * cap
+        r, c, w = pair_terms(group, 2 * penalty)
+        rows.append(r)
+        cols.append(c)
+        quad.append(w)
+
+    arrays = QuboArrays(linear, concat_parts(rows, np.intp), concat_parts(cols, np.intp),
+                        concat_parts(quad, float), 0.0, var_names)
+    return arrays, var_names
+
 
-        # Penalize > cap
-        for v in outgoing:
-            linear[v] = linear.get(v, 0) + penalty - 2 * penalty * cap
+def arrays_to_bqm(arrays, var_names):
+    """dimod BQM (BINARY) from packed arrays; duplicate COO pairs are summed."""
+    return dimod.BinaryQuadraticModel.from_numpy_vectors(
+        arrays.linear,
+        (arrays.rows, arrays.cols, arrays.quad),
+        arrays.offset,
+        dimod.BINARY,
+        variable_order=var_names,
+    )
 
-        for v1, v2 in itertools.combinations(outgoing, 2):
-            quadratic[(v1, v2)] = quadratic.get((v1, v2), 0) + 2 * penalty
 
-    # Build the BQM
-    bqm = dimod.BinaryQuadraticModel(linear, quadratic, 0, dimod.BINARY)
-    return bqm, var_names
+def build_network_qubo(sources, sinks, battery, costs, capacities, penalty=8.0):
+    """
+    sources: list of source node names, e.g. ["A", "B"]
+    sinks: dict of sink nodes and their demand, e.g. {"C":1, "D":1}
+    battery: str, name of battery node, e.g. "E"
+    costs: dict cost[source]
+    capacities: dict Gmax[source]
+
+    Returns: bqm, var_names
+    """
+    arrays, var_names = build_network_arrays(
+        sources, sinks, battery, costs, capacities, penalty
+    )
+    return arrays_to_bqm(arrays, var_names), var_names
@@ -1,11 +1,28 @@
+from src.qubo.energy import QuboArrays
+
+
 def decode_sample(bitstring, var_names):
-    """Convert measurement bitstring (e.g. '1010') → dict var -> 0/1"""
-    return {var_names[i]: int(bitstring[i]) for i in range(len(var_names))}
+    """Convert measurement bitstring (Qiskit order, qubit 0 rightmost) → dict var -> 0/1"""
+    bits = bitstring.replace(" ", "")[::-1]
+    return {var_names[i]: int(bits[i]) for i in range(len(var_names))}
 
 def expected_energy(counts, bqm, var_names):
-    total = sum(counts.values())
-    E = 0
-    for bitstring, c in counts.items():
-        sample = decode_sample(bitstring, var_names)
-        E += (c/total) * bqm.energy(sample)
-    return E
+    """Count-weighted mean BQM energy, one vectorized pass over the histogram."""
+    return QuboArrays.from_bqm(bqm, var_names).expected(counts)
+
+
+class PackedBQMs:
+    """
+    QuboArrays per (BQM, var_names), packed on first use. Backends keep one so
+    repeated run() calls on the same problem skip repacking; a BQM must not be
+    modified after it has been run.
+    """
+
+    def __init__(self):
+        self._arrays = {}
+
+    def get(self, bqm, var_names):
+        key = (id(bqm), tuple(var_names))
+        if key not in self._arrays:
+            self._arrays[key] = (bqm, QuboArrays.from_bqm(bqm, var_names))
+        return self._arrays[key][1]
@@ -0,0 +1,102 @@
+"""
+Streaming aggregation of measurement results: histogram, energy moments
+(Chan's update) and the best feasible sample, one result at a time.
+"""
+
+from concurrent.futures import as_completed
+
+import numpy as np
+
+from src.qubo.counts import Counts, as_counts
+
+
+class StreamingHistogram:
+    """
+    arrays: QuboArrays scoring the samples.
+    feasible: optional fun(X) -> (S,) bool, e.g. CompiledNetwork.feasible.
+    max_states: keep at most this many distinct states (heaviest first);
+    the moments and the best sample stay exact, only the histogram is pruned.
+    """
+
+    def __init__(self, arrays, feasible=None, max_states=None):
+        self.arrays = arrays
+        self.feasible = feasible
+        self.max_states = max_states
+        self.counts = None
+        self.batches = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.best = None             # (energy, bits) of the lowest-energy sample
+        self.best_feasible = None
+
+    def add(self, counts):
+        """Fold in one histogram (Counts, counts dict or quasi-distribution)."""
+        counts = as_counts(counts, self.arrays.n)
+        if len(counts) == 0:
+            return self
+        X = counts.bits()
+        E = self.arrays.energies(X)
+        w = counts.weights.astype(float)
+
+        n_b = w.sum()
+        mean_b = float(w @ E / n_b)
+        m2_b = float(w @ (E - mean_b) ** 2)
+        n = self.total + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self._m2 += m2_b + delta ** 2 * self.total * n_b / n
+        self.total = n
+
+        k = int(np.argmin(E))
+        if self.best is None or E[k] < self.best[0]:
+            self.best = (float(E[k]), tuple(int(b) for b in X[k]))
+        if self.feasible is not None:
+            ok = np.flatnonzero(self.feasible(X))
+            if len(ok):
+                k = ok[np.argmin(E[ok])]
+                if self.best_feasible is None or E[k] < self.best_feasible[0]:
+                    self.best_feasible = (float(E[k]), tuple(int(b) for b in X[k]))
+
+        self.counts = counts if self.counts is None else self.counts.merge(counts)
+        if self.max_states is not None and len(self.counts) > self.max_states:
+            self.counts = self.counts.top(self.max_states)
+        self.batches += 1
+        return self
+
+    @property
+    def variance(self):
+        """Per-shot energy variance."""
+        return self._m2 / self.total if self.total > 1 else float("inf")
+
+    @property
+    def stderr(self):
+        """Standard error of the mean energy."""
+        return float(np.sqrt(self.variance / self.total)) if self.total > 1 else float("inf")
+
+    def confidence_interval(self, z=1.96):
+        half = z * self.stderr
+        return self.mean - half, self.mean + half
+
+    def converged(self, tol, z=1.96, min_shots=0):
+        """True once the confidence half-width of the mean energy is below tol."""
+        return self.total >= min_shots and z * self.stderr <= tol
+
+    def top(self, k):
+        return self.counts.top(k) if self.counts is not None else None
+
+    def consume(self, futures, stop=None):
+        """
+        Ingest futures (from JobExecutor.submit / submit_one) as they complete.
+        Stops early when stop(self) is true, cancelling what has not started.
+        """
+        futures = list(futures)
+        for future in as_completed(futures):
+            counts = future.result()[0]
+            for c in (counts if isinstance(counts, list) else [counts]):
+                self.add(c)
+            if stop is not None and stop(self):
+                for f in futures:
+                    f.cancel()
+                break
+        return self
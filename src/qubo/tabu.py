@@ -0,0 +1,91 @@
+"""Multi-restart tabu search for QUBOs with incremental flip gains and aspiration."""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+def _tabu_walk(arrays, x, rng, max_iter, tenure, deadline):
+    W = arrays.adjacency()
+    indptr, indices, data = W.indptr, W.indices, W.data
+    lin = arrays.linear
+
+    x = x.astype(np.float64)
+    F = W @ x
+    gain = (1 - 2 * x) * (lin + F)
+    energy = float(arrays.energies(x))
+    best_x, best_e = x.copy(), energy
+    tabu_until = np.zeros(arrays.n, dtype=np.int64)
+
+    for it in range(max_iter):
+        if deadline is not None and it % 64 == 0 and time.monotonic() > deadline:
+            break
+        allowed = np.where(tabu_until <= it, gain, np.inf)
+        j = int(np.argmin(allowed))
+        k = int(np.argmin(gain))
+        if energy + gain[k] < best_e - 1e-12:
+            j = k                                     # aspiration
+        elif not np.isfinite(allowed[j]):
+            continue
+
+        dx = 1 - 2 * x[j]
+        energy += gain[j]
+        x[j] += dx
+        gain[j] = -gain[j]
+        lo, hi = indptr[j], indptr[j + 1]
+        nbrs = indices[lo:hi]
+        F[nbrs] += dx * data[lo:hi]
+        gain[nbrs] = (1 - 2 * x[nbrs]) * (lin[nbrs] + F[nbrs])
+        tabu_until[j] = it + tenure + rng.integers(0, max(1, tenure // 2) + 1)
+
+        if energy < best_e - 1e-12:
+            best_x, best_e = x.copy(), energy
+
+    return best_x.astype(np.uint8), best_e
+
+
+def _run_restarts(arrays, num_restarts, max_iter, tenure, deadline, seed):
+    rng = np.random.default_rng(seed)
+    X = np.empty((num_restarts, arrays.n), dtype=np.uint8)
+    E = np.empty(num_restarts)
+    for r in range(num_restarts):
+        if deadline is not None and r > 0 and time.monotonic() > deadline:
+            return X[:r], E[:r]
+        X[r], E[r] = _tabu_walk(arrays, rng.integers(0, 2, arrays.n), rng,
+                                max_iter, tenure, deadline)
+    return X, E
+
+
+def tabu_search(arrays, num_restarts=16, max_iter=None, tenure=None, time_limit=None,
+                seed=None, processes=1):
+    """
+    Multi-restart tabu search on a QuboArrays model.
+
+    Returns (X, E): the best state of each restart (R, n) uint8 and its energy.
+    max_iter defaults to 20 * n moves per restart, tenure to n // 4 (min 1).
+    time_limit (seconds) caps the whole call; restarts not yet started are
+    dropped. processes > 1 runs restarts in a process pool (None = all cores).
+    """
+    n = arrays.n
+    if n == 0:
+        # nothing left to flip (e.g. fully fixed by presolve): every restart is the empty state
+        return np.zeros((num_restarts, 0), dtype=np.uint8), np.full(num_restarts, float(arrays.offset))
+    max_iter = 20 * n if max_iter is None else max_iter
+    tenure = max(1, n // 4) if tenure is None else tenure
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, num_restarts))
+    if processes == 1:
+        return _run_restarts(arrays, num_restarts, max_iter, tenure, deadline, seed)
+
+    seeds = np.random.SeedSequence(seed).spawn(processes)
+    restarts = [num_restarts // processes + (k < num_restarts % processes) for k in range(processes)]
+    with ProcessPoolExecutor(processes) as pool:
+        parts = list(pool.map(_run_restarts, [arrays] * processes, restarts,
+                              [max_iter] * processes, [tenure] * processes,
+                              [deadline] * processes, seeds))
+    return np.vstack([X for X, _ in parts]), np.concatenate([E for _, E in parts])
@@ -1,6 +1,9 @@
+from src.qubo.counts import as_counts
+
+
 def print_solution(counts, var_names):
     """Print the most likely bitstring + decoded variables."""
-    best = max(counts, key=counts.get)
-    print("\nBest bitstring:", best)
-    for i, var in enumerate(var_names):
-        print(f"  {var} = {best[i]}")
+    top = as_counts(counts, len(var_names)).top(1)
+    print("\nBest bitstring:", next(iter(top)))
+    for var, bit in zip(var_names, top.bits()[0]):
+        print(f"  {var} = {bit}")
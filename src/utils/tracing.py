@@ -0,0 +1,155 @@
+"""
+Lightweight tracing spans for the QAOA pipeline; no-ops unless enabled by
+tracing.enable() or QAOA_TRACE=<prefix>. Exports JSON lines and Chrome traces.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+
+_tracer = None
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "attrs", "start")
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer.record(self.name, self.start, end - self.start, self.attrs)
+        return False
+
+    def set(self, **attrs):
+        """Attach attributes known only inside the span (shots, sizes, ...)."""
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    def __init__(self):
+        self.events = []            # (name, start_ns, duration_ns, thread id, attrs)
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+
+    def record(self, name, start, duration, attrs):
+        # list.append is atomic, spans may close on the executor's polling thread
+        self.events.append((name, start, duration, threading.get_ident(), attrs))
+
+    def _rows(self):
+        for name, start, duration, tid, attrs in list(self.events):
+            yield {
+                "name": name,
+                "start_us": (start - self.origin) / 1e3,
+                "duration_us": duration / 1e3,
+                "thread": tid,
+                **({"attrs": attrs} if attrs else {}),
+            }
+
+    def to_jsonl(self, path):
+        with open(path, "w") as f:
+            for row in self._rows():
+                f.write(json.dumps(row, default=str) + "\n")
+
+    def to_chrome(self, path):
+        events = [
+            {
+                "name": row["name"],
+                "cat": "qaoa",
+                "ph": "X",
+                "ts": row["start_us"],
+                "dur": row["duration_us"],
+                "pid": self.pid,
+                "tid": row["thread"],
+                "args": row.get("attrs", {}),
+            }
+            for row in self._rows()
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+    def summary(self):
+        """{name: (calls, total seconds)}."""
+        out = {}
+        for name, _, duration, _, _ in list(self.events):
+            calls, total = out.get(name, (0, 0.0))
+            out[name] = (calls + 1, total + duration / 1e9)
+        return out
+
+
+def span(name, **attrs):
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return _Span(tracer, name, attrs)
+
+
+def now():
+    """Timestamp for record(); 0 when tracing is off."""
+    return time.perf_counter_ns() if _tracer is not None else 0
+
+
+def record(name, start, **attrs):
+    """Span from an earlier now() until now, for intervals that cross call boundaries."""
+    tracer = _tracer
+    if tracer is not None and start:
+        tracer.record(name, start, time.perf_counter_ns() - start, attrs)
+
+
+def enable():
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def disable():
+    """Stop recording; returns the tracer with what was collected."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def get_tracer():
+    return _tracer
+
+
+def export(prefix, tracer=None):
+    """Write <prefix>.jsonl and <prefix>.trace.json; returns the tracer's summary."""
+    tracer = tracer or _tracer
+    if tracer is None:
+        return {}
+    tracer.to_jsonl(prefix + ".jsonl")
+    tracer.to_chrome(prefix + ".trace.json")
+    return tracer.summary()
+
+
+if os.environ.get("QAOA_TRACE"):
+    enable()
+    atexit.register(export, os.environ["QAOA_TRACE"])
@@ -0,0 +1,32 @@
+import numpy as np
+
+from src.qubo.counts import Counts
+
+
+def test_bitstring_keys_are_qiskit_order():
+    counts = Counts.from_dict({"001": 3, "110": 1}, 3)
+    bits = {tuple(row): w for row, w in zip(counts.bits().tolist(), counts.weights.tolist())}
+    # rightmost character is variable 0
+    assert bits == {(1, 0, 0): 3, (0, 1, 1): 1}
+    assert counts["001"] == 3 and counts[1] == 3
+
+
+def test_quasi_distribution_keys_match_bitstrings():
+    quasi = Counts.from_dict({1: 0.75, 6: 0.25}, 3)
+    assert quasi.to_dict() == {"001": 0.75, "110": 0.25}
+
+
+def test_round_trip_over_several_words():
+    rng = np.random.default_rng(0)
+    X = rng.integers(0, 2, (50, 130)).astype(np.uint8)
+    counts = Counts.from_bits(X)
+    again = Counts.from_dict(counts.to_dict(), 130)
+    assert np.array_equal(np.unique(X, axis=0), np.unique(again.bits(), axis=0))
+    assert again.total == 50
+
+
+def test_bits_are_cached_and_read_only():
+    counts = Counts.from_bits([[1, 0], [0, 1], [1, 0]])
+    assert counts.bits() is counts.bits()
+    assert not counts.bits().flags.writeable
+    assert counts.top(1).to_dict() == {"01": 2}
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from src.qubo.energy import QuboArrays
+from src.qubo.exhaustive import all_states, solve_exhaustive
+
+
+def random_arrays(n, seed):
+    rng = np.random.default_rng(seed)
+    rows, cols = np.triu_indices(n, 1)
+    keep = rng.random(len(rows)) < 0.5
+    return QuboArrays(rng.normal(size=n), rows[keep], cols[keep],
+                      rng.normal(size=keep.sum()), rng.normal())
+
+
+def odd_weight(X):
+    return X.sum(axis=1) % 2 == 1
+
+
+@pytest.mark.parametrize("n, low_bits", [(1, 4), (6, 2), (11, 4), (12, 12)])
+def test_matches_brute_force(n, low_bits):
+    arrays = random_arrays(n, seed=n)
+    X = all_states(n)
+    E = arrays.energies(X)
+
+    res = solve_exhaustive(arrays, top_k=5, feasible=odd_weight, processes=1, low_bits=low_bits)
+
+    assert res.n_states == 2 ** n
+    assert np.allclose([e for e, _ in res.top], np.sort(E)[:5])
+    for e, bits in res.top:
+        assert np.isclose(arrays.energies(np.array(bits)), e)
+    e, bits = res.best_feasible
+    assert np.isclose(e, E[odd_weight(X)].min()) and sum(bits) % 2 == 1
+
+
+def test_process_pool_agrees():
+    arrays = random_arrays(10, seed=3)
+    serial = solve_exhaustive(arrays, top_k=3, processes=1, low_bits=3)
+    pooled = solve_exhaustive(arrays, top_k=3, processes=2, low_bits=3)
+    assert np.allclose([e for e, _ in serial.top], [e for e, _ in pooled.top])
@@ -0,0 +1,68 @@
+import dimod
+import numpy as np
+import pytest
+
+from src.qaoa.gradients import ParameterShift
+from src.qaoa.qaoa_circuit import build_ising_template, build_xy_template
+from src.qaoa.statevector import StatevectorQAOA, check_template, circuit_state, diagonal_from_ising
+from src.qaoa.subspace import SubspaceQAOA
+
+
+def random_ising(n, seed):
+    rng = np.random.default_rng(seed)
+    h = rng.normal(size=n)
+    J = {(i, j): rng.normal() for i in range(n) for j in range(i + 1, n) if rng.random() < 0.6}
+    return h, J, rng.normal()
+
+
+def shift_gradient(template, params):
+    """Energy and parameter-shift gradient, every shifted circuit simulated exactly."""
+    shift = ParameterShift(template)
+    const, h, J = template.arrays.to_ising()
+    diag = diagonal_from_ising(h, J, const)
+    angles = [shift.angles(params)] + shift.shifted_angles(params)
+    energies = [float(np.abs(circuit_state(shift.bind(theta))) ** 2 @ diag) for theta in angles]
+    return energies[0], shift.combine(energies[1:])
+
+
+@pytest.mark.parametrize("p", [1, 2])
+def test_adjoint_matches_parameter_shift(p):
+    h, J, const = random_ising(5, seed=p)
+    template = build_ising_template(h, J, p, const=const)
+    params = np.linspace(0.2, 0.9, 2 * p)
+
+    e, g = StatevectorQAOA(h, J, const).expectation_and_gradient(params)
+    e_shift, g_shift = shift_gradient(template, params)
+
+    assert np.isclose(e, e_shift)
+    assert np.allclose(g, g_shift, atol=1e-8)
+
+
+def test_adjoint_matches_finite_differences():
+    h, J, const = random_ising(4, seed=7)
+    sim = StatevectorQAOA(h, J, const)
+    params = np.array([0.4, -0.3, 0.7, 0.1])
+    _, g = sim.expectation_and_gradient(params)
+    eps = 1e-6
+    fd = [(sim.expectation(params + eps * e) - sim.expectation(params - eps * e)) / (2 * eps)
+          for e in np.eye(len(params))]
+    assert np.allclose(g, fd, atol=1e-5)
+
+
+def test_template_circuit_matches_simulator():
+    h, J, const = random_ising(5, seed=3)
+    template = build_ising_template(h, J, 2, const=const)
+    assert check_template(template, [0.3, 0.5, 0.2, 0.4]) < 1e-8
+
+
+def test_xy_subspace_matches_parameter_shift():
+    bqm = dimod.BinaryQuadraticModel({0: -1.0, 1: 0.5, 2: 0.3, 3: -0.2, 4: 0.1},
+                                     {(0, 3): 0.7, (1, 4): -0.4, (2, 3): 0.2}, 0.0, dimod.BINARY)
+    template = build_xy_template(bqm, list(range(5)), [[0, 1, 2]], p=2, mixer="ring")
+    params = np.array([0.3, 0.6, 0.4, 0.2])
+
+    e, g = SubspaceQAOA.from_template(template).expectation_and_gradient(params)
+    e_shift, g_shift = shift_gradient(template, params)
+
+    assert np.isclose(e, e_shift)
+    assert np.allclose(g, g_shift, atol=1e-8)
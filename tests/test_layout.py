@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from qiskit.providers.fake_provider import GenericBackendV2
+
+from src.qaoa.gradients import ParameterShift
+from src.qaoa.layout import LayoutManager, RoutedTemplate
+from src.qaoa.qaoa_circuit import build_ising_template
+
+H = [0.5, -0.3, 0.2]
+J = {(0, 1): 1.0, (1, 2): -0.7, (0, 2): 1e-4}
+
+
+@pytest.fixture(scope="module")
+def device():
+    return GenericBackendV2(5, seed=1)
+
+
+def test_key_depends_on_structure_not_values(tmp_path, device):
+    lm = LayoutManager(str(tmp_path))
+    base = build_ising_template(H, J, 1)
+    scaled = build_ising_template([2 * h for h in H], {e: 2 * w for e, w in J.items()}, 1)
+    assert lm.key(base, device, {}) == lm.key(scaled, device, {})
+    assert lm.key(base, device, {}) != lm.key(build_ising_template(H, J, 2), device, {})
+    assert lm.key(base, device, {}) != lm.key(base, device, {"optimization_level": 1})
+
+
+def test_key_separates_cutoffs(tmp_path, device):
+    # tol=1e-3 drops the (0, 2) coupling, so the two templates emit different gates
+    lm = LayoutManager(str(tmp_path))
+    loose = build_ising_template(H, J, 1, tol=1e-3)
+    tight = build_ising_template(H, J, 1)
+    assert lm.key(loose, device, {}) != lm.key(tight, device, {})
+
+    theta = lm.shift(tight).angles(np.array([0.3, 0.7]))
+    lm._skeletons[lm.key(tight, device, {})] = lm.skeleton(loose, device)
+    with pytest.raises(ValueError):
+        lm.bind_angles(tight, theta, device)
+
+
+def test_shift_batches_bind_through_cache(tmp_path, device):
+    lm = LayoutManager(str(tmp_path))
+    routed = RoutedTemplate(build_ising_template(H, J, 1), lm)
+    shift = ParameterShift(routed)
+    theta = shift.angles(np.array([0.3, 0.7]))
+
+    qc = shift.bind(theta, device)
+    assert not qc.parameters
+    assert qc == lm.bind_angles(routed.template, theta, device)
+    assert (lm.misses, lm.hits) == (1, 0)
+
+    # a fresh manager on the same directory loads the routed skeleton from disk
+    again = LayoutManager(str(tmp_path))
+    assert again.bind_angles(routed.template, theta, device) == qc
+    assert (again.misses, again.hits) == (0, 1)
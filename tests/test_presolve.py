@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from src.experiments.network_reference_solver import P, build_network
+from src.qubo.counts import Counts
+from src.qubo.energy import QuboArrays
+from src.qubo.exhaustive import all_states
+from src.qubo.presolve import presolve, substitute
+
+
+def penalty_arrays(n, seed, extra=3):
+    """
+    Random costs plus one-hot penalties over disjoint groups of n variables,
+    and `extra` strongly biased variables that presolve can fix.
+    """
+    rng = np.random.default_rng(seed)
+    linear = np.concatenate([rng.uniform(-1, 1, n), rng.choice([-5.0, 5.0], extra)])
+    rows, cols, quad = [], [], []
+    for i in range(n):
+        for j in range(i + 1, n):
+            if rng.random() < 0.3:
+                rows.append(i)
+                cols.append(j)
+                quad.append(rng.uniform(-1, 1))
+    for group in np.array_split(rng.permutation(n), n // 3):
+        linear[group] -= 10.0
+        for a in range(len(group)):
+            for b in range(a + 1, len(group)):
+                rows.append(min(group[a], group[b]))
+                cols.append(max(group[a], group[b]))
+                quad.append(20.0)
+    for i in range(n, n + extra):
+        for j in rng.choice(n, 2, replace=False):
+            rows.append(j)
+            cols.append(i)
+            quad.append(rng.uniform(-1, 1))
+    return QuboArrays(linear, rows, cols, quad, 10.0 * (n // 3))
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_reduced_problem_is_exact(seed):
+    arrays = penalty_arrays(9, seed)
+    pre = presolve(arrays, seed=seed)
+    assert 0 < pre.n < arrays.n
+
+    Y = all_states(pre.n)
+    X = pre.expand(Y)
+    assert np.allclose(pre.arrays.energies(Y), arrays.energies(X))
+    assert np.array_equal(pre.restrict(X), Y)
+    # the reduced optimum is an optimum of the original
+    assert np.isclose(pre.arrays.energies(Y).min(), arrays.energies(all_states(arrays.n)).min())
+
+
+def test_expand_counts_keeps_weights():
+    arrays = penalty_arrays(9, seed=11)
+    pre = presolve(arrays, seed=0)
+    Y = all_states(pre.n)[:4]
+    counts = pre.expand_counts(Counts.from_bits(Y, [5, 3, 2, 1]))
+    assert counts.n == arrays.n
+    assert sorted(counts.weights.tolist()) == [1, 2, 3, 5]
+    assert np.array_equal(pre.restrict(pre.expand(Y)), Y)
+
+
+def test_substitute_with_merges():
+    arrays = penalty_arrays(6, seed=3, extra=2)
+    # x0, x3 fixed; x1 = y0, x2 = 1 - y0, x4 = y1, x5 = 1 - y2, x6 = y1, x7 = y2
+    a = np.array([1, 0, 1, 0, 0, 1, 0, 0])
+    b = np.array([0, 1, -1, 0, 1, -1, 1, 1])
+    k = np.array([0, 0, 0, 0, 1, 2, 1, 2])
+    reduced = substitute(arrays, a, b, k, 3)
+    Y = all_states(3)
+    X = (a + b * Y[:, k]).astype(np.uint8)
+    assert np.allclose(reduced.energies(Y), arrays.energies(X))
+
+
+def test_network_model_is_fully_fixed():
+    model = build_network().compile(P)
+    pre = presolve(model.arrays)
+    assert pre.n == 0
+    X = pre.expand(np.zeros((1, 0)))
+    assert model.feasible(X)[0]
+    assert np.isclose(model.arrays.energies(X)[0], model.reference()[0])